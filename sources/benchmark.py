@@ -0,0 +1,72 @@
+"""
+© 2022-2025 Wei-Ting Yang. All rights reserved.
+"""
+
+import argparse
+import sys
+
+from game.benchmarks import Benchmark
+
+
+class Program:
+
+    def __init__(self) -> None:
+        self._check_requirements()
+        arguments = self._parse_arguments()
+
+        benchmark = Benchmark(
+            width=arguments.width,
+            height=arguments.height,
+            obstacle_density=arguments.obstacle_density,
+            blue_count=arguments.blue,
+            red_count=arguments.red,
+            seed=arguments.seed,
+            use_numpy=not arguments.no_numpy,
+        )
+        results = benchmark.run(arguments.rounds)
+
+        print(f"{"Operation":<24}{"Median (us)":>14}{"Min (us)":>14}{"Nodes/call":>14}")
+        for operation, result in results.items():
+            print(
+                f"{operation:<24}{result["median_us"]:>14.2f}{result["min_us"]:>14.2f}"
+                f"{result["nodes_per_call"]:>14.1f}"
+            )
+
+        if arguments.save:
+            benchmark.save(arguments.save, results)
+
+        if arguments.compare:
+            baseline = Benchmark.load(arguments.compare)
+            if baseline["scenario"] != benchmark.scenario:
+                print(f"Warning: the baseline was recorded with {baseline["scenario"]}.")
+
+            if regressions := Benchmark.compare(results, baseline["results"], arguments.threshold):
+                print("Regressions:")
+                for regression in regressions:
+                    print(f"  {regression}")
+                sys.exit(1)
+
+            print(f"No regression beyond {arguments.threshold:.0%}.")
+
+    def _check_requirements(self) -> None:
+        if sys.version_info < (3, 12):
+            sys.exit("Python version >= 3.12 is required.")
+
+    def _parse_arguments(self) -> argparse.Namespace:
+        parser = argparse.ArgumentParser(description="Benchmark pathfinding, hunting and combat.")
+        parser.add_argument("--width", default=21, type=int, help="number of field tiles per row")
+        parser.add_argument("--height", default=13, type=int, help="number of field tiles per column")
+        parser.add_argument("--obstacle-density", default=0.15, type=float, help="share of rock and tree tiles")
+        parser.add_argument("--blue", default=6, type=int, help="number of blue soldiers")
+        parser.add_argument("--red", default=18, type=int, help="number of red soldiers")
+        parser.add_argument("--seed", default=0, type=int, help="seed of the synthetic board")
+        parser.add_argument("--rounds", default=10, type=int, help="number of measured rounds per operation")
+        parser.add_argument("--no-numpy", action="store_true", help="keep the board in dicts even if NumPy is installed")
+        parser.add_argument("--save", metavar="PATH", help="save the results as a baseline")
+        parser.add_argument("--compare", metavar="PATH", help="compare the results against a baseline")
+        parser.add_argument("--threshold", default=0.1, type=float, help="tolerated slowdown (0.1 for 10%%)")
+        return parser.parse_args()
+
+
+if __name__ == "__main__":
+    program = Program()
@@ -0,0 +1,138 @@
+import heapq
+import tkinter as tk
+from collections.abc import Callable, Hashable, Iterable
+from itertools import count
+from math import ceil
+from time import perf_counter
+
+from game.states import GameState
+
+
+class Timeline:
+    """
+    Play animations through Tk's after, so the game never sleeps in a nested event
+    loop. An animation is a series of steps, each a callback and its delay in
+    milliseconds from the start of the animation, occupying a set of tracks (the
+    game objects and coordinates it shows) for its duration. It starts as soon as
+    all of its tracks are free, so animations of independent units overlap while
+    the ones sharing a unit or a tile play one after another.
+    """
+
+    def __init__(self, widget: tk.Misc, speed: float = 1.0) -> None:
+        self._widget = widget
+        self.speed = speed
+
+        self._end_by_track: dict[Hashable, float] = {}
+        self._steps: list[tuple[float, int, Callable[[], None]]] = []
+        self._sequence = count()
+        self._after_id = None
+        self._idle_callbacks: list[Callable[[], None]] = []
+
+    @property
+    def is_playing(self) -> bool:
+        return bool(self._steps)
+
+    def add(
+        self,
+        tracks: Iterable[Hashable],
+        steps: Iterable[tuple[int, Callable[[], None]]] = (),
+        duration: int = 0,
+    ) -> None:
+        """
+        Queue an animation made of steps on tracks, which stay busy for duration
+        milliseconds. An animation whose tracks are all free and whose steps have no
+        delay runs at once. With a speed of 0, every animation runs at once.
+        """
+        if self.speed <= 0.0:
+            for _, callback in steps:
+                callback()
+            return
+
+        now = self._get_time()
+        tracks = tuple(tracks)
+        start = max([now, *(self._end_by_track.get(track, now) for track in tracks)])
+
+        if start == now and not self._steps and all(delay == 0 for delay, _ in steps) and duration == 0:
+            for _, callback in steps:
+                callback()
+            return
+
+        for delay, callback in steps:
+            heapq.heappush(self._steps, (start + delay / self.speed, next(self._sequence), callback))
+
+        end = start + duration / self.speed
+        # Keep the timeline busy until the animation is over, even after its last step
+        heapq.heappush(self._steps, (end, next(self._sequence), _do_nothing))
+        for track in tracks:
+            self._end_by_track[track] = end
+
+        self._schedule()
+
+    def when_idle(self, callback: Callable[[], None]) -> None:
+        """
+        Call callback once every queued animation has played.
+        """
+        if self._steps:
+            self._idle_callbacks.append(callback)
+        else:
+            callback()
+
+    def _get_time(self) -> float:
+        return perf_counter() * 1000.0
+
+    def _schedule(self) -> None:
+        if self._after_id:
+            self._widget.after_cancel(self._after_id)
+            self._after_id = None
+
+        if self._steps:
+            delay = max(ceil(self._steps[0][0] - self._get_time()), 0)
+            self._after_id = self._widget.after(delay, self._play)
+
+    def _play(self) -> None:
+        self._after_id = None
+        now = self._get_time()
+
+        while self._steps and self._steps[0][0] <= now:
+            *_, callback = heapq.heappop(self._steps)
+            callback()
+
+        if self._steps:
+            self._schedule()
+        else:
+            self._end_by_track.clear()
+
+            callbacks = self._idle_callbacks
+            self._idle_callbacks = []
+            for callback in callbacks:
+                callback()
+
+
+def animate(
+    tracks: Iterable[Hashable],
+    steps: Iterable[tuple[int, Callable[[], None]]] = (),
+    duration: int = 0,
+) -> None:
+    """
+    Queue an animation on the game's timeline, or run its steps at once if there is
+    none, as when running headless.
+    """
+    if timeline := GameState.timeline:
+        timeline.add(tracks, steps, duration)
+    else:
+        for _, callback in steps:
+            callback()
+
+
+def when_idle(callback: Callable[[], None]) -> None:
+    """
+    Call callback once every queued animation has played.
+    """
+    if timeline := GameState.timeline:
+        timeline.when_idle(callback)
+    else:
+        callback()
+
+
+def _do_nothing() -> None:
+    pass
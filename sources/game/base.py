@@ -2,9 +2,14 @@ import sys
 import tkinter as tk
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from functools import partial
 from tkinter import ttk
 
-from game.utilities import get_pixels
+from game.animations import animate
+from game.configurations import Dimension
+from game.instrumentation import instrumented
+from game.states import Environment
+from game.utilities import get_pixels, get_shades
 
 
 class GameObjectModel:
@@ -38,6 +43,10 @@ class GameObjectView(ABC):
         self._widgets: dict[str, ttk.Widget] = {}
         self._ids: dict[str, int] = {}
 
+        # The options each widget and canvas item was last rendered with
+        self._widget_options: dict[str, dict] = {}
+        self._item_options: dict[str, dict] = {}
+
         self._create_widgets()
         if attach:
             self.attach_widgets(model.get_data())
@@ -56,6 +65,7 @@ class GameObjectView(ABC):
         for widget in self._widgets.values():
             widget.destroy()
         self._widgets.clear()
+        self._widget_options.clear()
 
     def attach_widgets(self, data: dict) -> None:
         self._ids["main"] = self.canvas.create_window(
@@ -67,6 +77,7 @@ class GameObjectView(ABC):
         for id_ in self._ids.values():
             self.canvas.delete(id_)
         self._ids.clear()
+        self._item_options.clear()
 
     def lift_widgets(self) -> None:
         for widget in self._widgets.values():
@@ -75,13 +86,252 @@ class GameObjectView(ABC):
     def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
         pass
 
+    def _configure_widget(self, name: str, **options) -> None:
+        """
+        Configure the widget name with only the options that differ from the ones
+        it was last rendered with.
+        """
+        if changes := _get_changes(self._widget_options.setdefault(name, {}), options):
+            self._widgets[name].configure(**changes)
+
+    def _configure_item(self, name: str, **options) -> None:
+        """
+        Configure the canvas item name with only the options that differ from the
+        ones it was last rendered with.
+        """
+        if changes := _get_changes(self._item_options.setdefault(name, {}), options):
+            self.canvas.itemconfigure(self._ids[name], **changes)
+
+    def _lower_below_units(self, id_: int) -> None:
+        """
+        Keep a canvas item underneath units, as they are drawn on the canvas too.
+        """
+        if self.canvas.find_withtag("unit"):
+            self.canvas.tag_lower(id_, "unit")
+
+
+class UnitView(GameObjectView):
+    """
+    A unit drawn with canvas items rather than embedded widgets: a raised box
+    holding the unit's image, topped by a health bar. All items of a unit share a
+    tag, through which they are moved, raised and bound together.
+    """
+
+    BORDER_WIDTH = 3
+    BOX_DIMENSION = 46
+
+    def __init__(self, model: GameObjectModel, canvas: tk.Canvas, attach: bool = True) -> None:
+        self._tag = f"unit_{id(self)}"
+        self._cursor = ""
+        self._data = None
+        self._event_handlers = None
+        self._pixels = None
+        self._health_bar_length = None
+        self._handler_by_sequence: dict[str, Callable] = {}
+
+        # Moves requested since the canvas was last updated, applied at once when idle
+        self._pending_move = (0.0, 0.0)
+        self._move_after_id = None
+
+        super().__init__(model, canvas, attach)
+
+        self._bind("<Enter>", self._handle_enter_event)
+        self._bind("<Leave>", self._handle_leave_event)
+
+    def destroy(self) -> None:
+        for sequence in list(self._handler_by_sequence):
+            self._bind(sequence, None)
+
+        super().destroy()
+
+    def _create_widgets(self) -> None:
+        pass
+
+    def attach_widgets(self, data: dict) -> None:
+        x, y = self._pixels = get_pixels(data["x"], data["y"])
+        tags = ("unit", self._tag)
+
+        # Box
+        x0, y0 = x - self.BOX_DIMENSION / 2, y + 5.0 - self.BOX_DIMENSION / 2
+        x1, y1 = x0 + self.BOX_DIMENSION, y0 + self.BOX_DIMENSION
+        b = self.BORDER_WIDTH
+        self._ids["box"] = self.canvas.create_rectangle(x0, y0, x1, y1, width=0, tags=tags)
+        self._ids["light_border"] = self.canvas.create_polygon(
+            x0, y0, x1, y0, x1 - b, y0 + b, x0 + b, y0 + b, x0 + b, y1 - b, x0, y1,
+            width=0,
+            tags=tags,
+        )
+        self._ids["dark_border"] = self.canvas.create_polygon(
+            x1, y1, x0, y1, x0 + b, y1 - b, x1 - b, y1 - b, x1 - b, y0 + b, x1, y0,
+            width=0,
+            tags=tags,
+        )
+        self._ids["main"] = self.canvas.create_image(x, y + 5.0, tags=tags)
+
+        # Health bar
+        x0, y0 = x - Dimension.HEALTH_BAR_LENGTH / 2, y - 22.5 - 2.5
+        self._ids["health_trough"] = self.canvas.create_rectangle(
+            x0, y0, x0 + Dimension.HEALTH_BAR_LENGTH, y0 + 5.0,
+            fill="Red",
+            width=0,
+            tags=tags,
+        )
+        self._ids["health_bar"] = self.canvas.create_rectangle(
+            x0, y0, x0 + Dimension.HEALTH_BAR_LENGTH, y0 + 5.0,
+            fill="Green",
+            width=0,
+            tags=tags,
+        )
+        self._health_bar_length = Dimension.HEALTH_BAR_LENGTH
+
+        self._attach_extra_items(x, y, tags)
+
+        if self._data:
+            self._render()
+
+    def _attach_extra_items(self, x: float, y: float, tags: tuple[str, str]) -> None:
+        pass
+
+    def lift_widgets(self) -> None:
+        self.canvas.tag_raise(self._tag)
+
+    def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
+        self._data = data
+        self._event_handlers = event_handlers
+
+        if self._ids:
+            self._render()
+
+    @abstractmethod
+    def _render(self) -> None:
+        raise NotImplementedError
+
+    def detach_widgets(self) -> None:
+        if self._move_after_id:
+            self.canvas.after_cancel(self._move_after_id)
+            self._move_after_id = None
+        self._pending_move = (0.0, 0.0)
+
+        super().detach_widgets()
+
+    def move_by(self, dx: float, dy: float) -> None:
+        """
+        Move the unit's items by dx, dy pixels once Tk is idle. Moves requested
+        before then, such as those of a burst of motion events while dragging, are
+        added up and sent to Tk as one.
+        """
+        pending_dx, pending_dy = self._pending_move
+        self._pending_move = (pending_dx + dx, pending_dy + dy)
+
+        if not self._move_after_id:
+            self._move_after_id = self.canvas.after_idle(self._handle_idle)
+
+    def flush_moves(self) -> None:
+        """
+        Apply the pending moves now, before reading where the unit's items are.
+        """
+        if self._move_after_id:
+            self.canvas.after_cancel(self._move_after_id)
+            self._move_after_id = None
+
+        if self._pending_move != (0.0, 0.0):
+            self.canvas.move(self._tag, *self._pending_move)
+            self._pending_move = (0.0, 0.0)
+
+    def _handle_idle(self) -> None:
+        self._move_after_id = None
+        self.flush_moves()
+
+    def hide_images(self) -> None:
+        """
+        Hide the unit's images, leaving its bare box, until the next refresh.
+        """
+        for name in ("main", "level"):
+            if name in self._ids:
+                self._configure_item(name, state=tk.HIDDEN)
+
+    def _bind(self, sequence: str, handler: Callable | None) -> None:
+        """
+        Bind handler to sequence on every item of the unit, or unbind sequence if
+        handler is None. Nothing is sent to Tk if the binding is already in place.
+        """
+        if self._handler_by_sequence.get(sequence) == handler:
+            return
+
+        if handler:
+            self.canvas.tag_bind(self._tag, sequence, handler)
+            self._handler_by_sequence[sequence] = handler
+        else:
+            self.canvas.tag_unbind(self._tag, sequence)
+            del self._handler_by_sequence[sequence]
+
+    def _move_items_to(self, x: int, y: int) -> None:
+        pixels = get_pixels(x, y)
+        if pixels != self._pixels:
+            self.canvas.move(self._tag, pixels[0] - self._pixels[0], pixels[1] - self._pixels[1])
+            self._pixels = pixels
+
+    def _configure_box(self, hex_triplet: str, relief: str = tk.RAISED) -> None:
+        light, dark = get_shades(hex_triplet)
+        if relief == tk.SUNKEN:
+            light, dark = dark, light
+
+        self._configure_item("box", fill=hex_triplet)
+        self._configure_item("light_border", fill=light)
+        self._configure_item("dark_border", fill=dark)
+
+    def _configure_health_bar(self, health: float, max_health: float) -> None:
+        length = Dimension.HEALTH_BAR_LENGTH * round(health, 2) / round(max_health, 2)
+        if length != self._health_bar_length:
+            x0, y0 = self._pixels[0] - Dimension.HEALTH_BAR_LENGTH / 2, self._pixels[1] - 22.5 - 2.5
+            self.canvas.coords(self._ids["health_bar"], x0, y0, x0 + length, y0 + 5.0)
+            self._health_bar_length = length
+
+    def _handle_enter_event(self, event: tk.Event) -> None:
+        self.canvas.configure(cursor=self._cursor)
+
+    def _handle_leave_event(self, event: tk.Event) -> None:
+        self.canvas.configure(cursor="")
+
+
+class NullGameObjectView(GameObjectView):
+    """
+    A view that renders nothing, used in place of every view when running headless.
+    """
+
+    def __init__(self, model: GameObjectModel, canvas: tk.Canvas | None = None, attach: bool = True) -> None:
+        self.canvas = None
+        self._widgets = {}
+        self._ids = {}
+        self._widget_options = {}
+        self._item_options = {}
+
+    def _create_widgets(self) -> None:
+        pass
+
+    def attach_widgets(self, data: dict) -> None:
+        pass
+
+
+def _get_changes(rendered: dict, options: dict) -> dict:
+    """
+    Return the options whose values differ from rendered, and record them in it.
+    """
+    changes = {key: value for key, value in options.items() if key not in rendered or rendered[key] != value}
+    rendered.update(changes)
+    return changes
+
 
 class GameObject:
 
     @classmethod
+    @instrumented("create")
     def create(cls, model_config: dict, view_config: dict) -> "GameObject":
         model = cls.get_model_class()(**model_config)
-        view = cls.get_view_class()(model, **view_config)
+        if Environment.headless:
+            view = NullGameObjectView(model, **view_config)
+        else:
+            view = cls.get_view_class()(model, **view_config)
         return cls(model, view)
 
     @classmethod
@@ -101,14 +351,34 @@ class GameObject:
         self._register()
 
     def destroy(self) -> None:
+        self.retire()
+        self.dispose()
+
+    def retire(self) -> None:
+        """
+        Remove self from the game, leaving its view on screen until disposed of.
+        """
         self._unregister()
-        self.view.destroy()
+
+    def dispose(self) -> None:
+        """
+        Destroy the view and model of self, once retired.
+        """
+        # The view goes away once its pending animations have played.
+        animate((self,), ((0, self.view.destroy),))
         self.view = None
         self.model.destroy()
         self.model = None
 
+    @instrumented("refresh")
     def refresh(self) -> None:
-        self.view.refresh(self.model.get_data(), self.event_handlers)
+        self.render(self.model.get_data())
+
+    def render(self, data: dict) -> None:
+        """
+        Show data, a state of self's model, after self's pending animations.
+        """
+        animate((self,), ((0, partial(self.view.refresh, data, self.event_handlers)),))
 
     @abstractmethod
     def _register(self) -> None:
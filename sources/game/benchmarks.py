@@ -0,0 +1,193 @@
+import json
+import random
+import statistics
+from collections.abc import Callable
+from time import perf_counter
+
+from game import pathfinding
+from game.configurations import Color, Dimension
+from game.grids import Grid
+from game.soldiers import Archer, Cavalry, Hero, Infantry
+from game.states import Environment, GameState
+
+
+class Benchmark:
+    """
+    Time the hot paths of the game on seeded synthetic boards. The board is rebuilt
+    from the same seed before every round, and cached searches are invalidated, so
+    every round measures the same cold work.
+    """
+
+    OPERATIONS = ("reachable_coordinates", "approaching_path", "damage_output", "hunt")
+
+    def __init__(
+        self,
+        width: int = 21,
+        height: int = 13,
+        obstacle_density: float = 0.15,
+        blue_count: int = 6,
+        red_count: int = 18,
+        seed: int = 0,
+        use_numpy: bool = True,
+    ) -> None:
+        self.scenario = {
+            "width": width,
+            "height": height,
+            "obstacle_density": obstacle_density,
+            "blue_count": blue_count,
+            "red_count": red_count,
+            "seed": seed,
+            "use_numpy": use_numpy,
+        }
+
+    def run(self, rounds: int = 10) -> dict[str, dict[str, float]]:
+        """
+        Return the median time per call in microseconds and the number of tiles the
+        searches settled per call, by operation.
+        """
+        results = {}
+
+        for operation in self.OPERATIONS:
+            durations = []
+            call_count = node_count = 0
+
+            for _ in range(rounds):
+                self._build_board()
+                measure = getattr(self, f"_measure_{operation}")
+
+                nodes_before = pathfinding.node_count_by_search.total()
+                duration, call_count = measure()
+                node_count = pathfinding.node_count_by_search.total() - nodes_before
+
+                durations.append(duration / call_count * 1e6)
+
+            results[operation] = {
+                "median_us": statistics.median(durations),
+                "min_us": min(durations),
+                "nodes_per_call": node_count / call_count,
+            }
+
+        return results
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+        """
+        Return a description of every operation that got slower, or settled more
+        tiles, than in baseline by more than threshold (0.1 for 10%).
+        """
+        regressions = []
+
+        for operation, result in results.items():
+            if (reference := baseline.get(operation)) is None:
+                continue
+
+            for metric in ("median_us", "nodes_per_call"):
+                if reference[metric] and result[metric] > reference[metric] * (1.0 + threshold):
+                    regressions.append(
+                        f"{operation}: {metric} {reference[metric]:.2f} -> {result[metric]:.2f} "
+                        f"(+{result[metric] / reference[metric] - 1.0:.0%})"
+                    )
+
+        return regressions
+
+    def save(self, path: str, results: dict) -> None:
+        with open(path, "w") as file:
+            json.dump({"scenario": self.scenario, "results": results}, file, indent=4)
+
+    @staticmethod
+    def load(path: str) -> dict:
+        with open(path) as file:
+            return json.load(file)
+
+    def _build_board(self) -> None:
+        scenario = self.scenario
+        rng = random.Random(scenario["seed"])
+
+        Dimension.HORIZONTAL_FIELD_TILE_COUNT = scenario["width"]
+        Dimension.HORIZONTAL_TILE_COUNT = scenario["width"] + Dimension.HORIZONTAL_PANEL_TILE_COUNT
+        Dimension.VERTICAL_TILE_COUNT = scenario["height"]
+
+        Environment.headless = True
+        GameState.reset()
+        pathfinding.reset()
+
+        for y in range(scenario["height"]):
+            for x in range(scenario["width"]):
+                GameState.cost_by_coordinate[(x, y)] = -1 if rng.random() < scenario["obstacle_density"] else 1
+
+        GameState.revisions["cost"] += 1
+
+        free_coordinates = [
+            (x, y)
+            for y in range(1, scenario["height"] - 1)
+            for x in range(1, scenario["width"] - 1)
+        ]
+        rng.shuffle(free_coordinates)
+
+        for _ in range(scenario["blue_count"]):
+            x, y = free_coordinates.pop()
+            soldier_class = rng.choice([Archer, Cavalry, Hero, Infantry])
+            soldier_class.create({"x": x, "y": y, "color": Color.BLUE}, {})
+
+        for _ in range(scenario["red_count"]):
+            x, y = free_coordinates.pop()
+            soldier_class = rng.choice([Archer, Cavalry, Infantry])
+            soldier_class.create({"x": x, "y": y, "color": Color.RED}, {})
+
+        if scenario["use_numpy"]:
+            GameState.grid = Grid.create()
+
+    def _measure_reachable_coordinates(self) -> tuple[float, int]:
+        soldiers = [*GameState.soldiers["blue"], *GameState.soldiers["red"]]
+
+        def operation() -> None:
+            for soldier in soldiers:
+                GameState.revisions["cost"] += 1
+                soldier.model.get_reachable_coordinates()
+
+        return self._time(operation), len(soldiers)
+
+    def _measure_approaching_path(self) -> tuple[float, int]:
+        # As during a turn, distance fields are shared by every pair toward a target.
+        pairs = [
+            (soldier.model, hostile_unit.model)
+            for soldier in GameState.soldiers["red"]
+            for hostile_unit in GameState.blue_unit_by_coordinate.values()
+        ]
+
+        def operation() -> None:
+            GameState.revisions["cost"] += 1
+            for model, hostile_model in pairs:
+                model.get_approaching_path(hostile_model)
+
+        return self._time(operation), len(pairs)
+
+    def _measure_damage_output(self) -> tuple[float, int]:
+        pairs = [
+            (soldier.model, hostile_unit.model)
+            for soldier in GameState.soldiers["red"]
+            for hostile_unit in GameState.blue_unit_by_coordinate.values()
+        ]
+
+        def operation() -> None:
+            for model, hostile_model in pairs:
+                model.get_damage_output_against(hostile_model)
+
+        return self._time(operation), len(pairs)
+
+    def _measure_hunt(self) -> tuple[float, int]:
+        soldiers = list(GameState.soldiers["red"])
+
+        def operation() -> None:
+            GameState.revisions["cost"] += 1
+            for soldier in soldiers:
+                if GameState.blue_unit_by_coordinate:
+                    soldier.hunt()
+
+        return self._time(operation), len(soldiers)
+
+    @staticmethod
+    def _time(operation: Callable[[], None]) -> float:
+        start = perf_counter()
+        operation()
+        return perf_counter() - start
@@ -16,11 +16,11 @@ class Barrack(Building):
 
     def _register(self) -> None:
         super()._register()
-        GameState.buildings["critical"].add(self)
+        GameState.buildings["critical"][self] = None
 
     def _unregister(self) -> None:
         super()._unregister()
-        GameState.buildings["critical"].remove(self)
+        del GameState.buildings["critical"][self]
 
     def _handle_selection(self) -> None:
         super()._handle_selection()
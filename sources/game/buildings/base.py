@@ -1,13 +1,11 @@
 import tkinter as tk
 from collections.abc import Callable
-from tkinter import ttk
 
-from game.base import GameObject, GameObjectModel, GameObjectView
-from game.configurations import Dimension
+from game.base import GameObject, GameObjectModel, UnitView
+from game.configurations import Color
 from game.images import Image
 from game.recruitments.base import SoldierRecruitment
 from game.states import GameState
-from game.utilities import get_pixels
 
 
 class BuildingModel(GameObjectModel):
@@ -27,52 +25,58 @@ class BuildingModel(GameObjectModel):
         return data
 
 
-class BuildingView(GameObjectView):
+class BuildingView(UnitView):
+    """
+    A unit that behaves like a button: its box sinks while pressed, and releasing
+    the mouse button over it triggers a click.
+    """
 
-    def _create_widgets(self) -> None:
-        self._widgets["main"] = ttk.Button(
-            self.canvas,
-            cursor="hand2",
-            image=getattr(Image, type(self).__name__.removesuffix("View").lower()),
-            style="CustomBlue.TButton",
-            takefocus=False,
-        )
-        self._widgets["health_bar"] = ttk.Progressbar(
-            self.canvas,
-            length=Dimension.HEALTH_BAR_LENGTH,
-            mode="determinate",
-            orient=tk.HORIZONTAL,
-            style="Green_Red.Horizontal.TProgressbar",
-        )
+    def __init__(self, model: BuildingModel, canvas: tk.Canvas, attach: bool = True) -> None:
+        super().__init__(model, canvas, attach)
 
-    def attach_widgets(self, data: dict) -> None:
-        self._ids["main"] = self.canvas.create_window(
-            *get_pixels(data["x"], data["y"], y_pixel_shift=5.0),
-            window=self._widgets["main"],
-        )
-        self._ids["health_bar"] = self.canvas.create_window(
-            *get_pixels(data["x"], data["y"], y_pixel_shift=-22.5),
-            window=self._widgets["health_bar"],
-        )
+        self._cursor = "hand2"
+        self._bind("<ButtonPress-1>", self._handle_press_event)
+        self._bind("<ButtonRelease-1>", self._handle_release_event)
+
+    def _render(self) -> None:
+        data = self._data
 
-    def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
-        self._widgets["main"].configure(
-            command=event_handlers["click"],
+        self._move_items_to(data["x"], data["y"])
+        self._configure_box(Color.BLUE)
+        self._configure_item(
+            "main",
             image=getattr(Image, type(self).__name__.removesuffix("View").lower()),
+            state=tk.NORMAL,
         )
-        self._widgets["health_bar"].configure(
-            value=round(data["health"], 2),
-            maximum=round(data["max_health"], 2),
-        )
+        self._configure_health_bar(data["health"], data["max_health"])
+
+    def _handle_press_event(self, event: tk.Event) -> None:
+        self._configure_box(Color.BLUE, relief=tk.SUNKEN)
+
+    def _handle_release_event(self, event: tk.Event) -> None:
+        self._configure_box(Color.BLUE)
+
+        if self._ids["box"] in self.canvas.find_overlapping(event.x, event.y, event.x, event.y):
+            self._event_handlers["click"]()
 
 
 class Building(GameObject):
 
     def _register(self) -> None:
         GameState.blue_unit_by_coordinate[(self.model.x, self.model.y)] = self
+        GameState.unit_index.add(Color.BLUE, (self.model.x, self.model.y))
+        GameState.revisions[Color.BLUE] += 1
+
+        if grid := GameState.grid:
+            grid.occupy(Color.BLUE, (self.model.x, self.model.y))
 
     def _unregister(self) -> None:
         del GameState.blue_unit_by_coordinate[(self.model.x, self.model.y)]
+        GameState.unit_index.remove(Color.BLUE, (self.model.x, self.model.y))
+        GameState.revisions[Color.BLUE] += 1
+
+        if grid := GameState.grid:
+            grid.vacate(Color.BLUE, (self.model.x, self.model.y))
 
     @property
     def event_handlers(self) -> dict[str, Callable]:
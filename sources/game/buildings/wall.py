@@ -16,8 +16,8 @@ class Wall(Building):
 
     def _register(self) -> None:
         super()._register()
-        GameState.buildings["noncritical"].add(self)
+        GameState.buildings["noncritical"][self] = None
 
     def _unregister(self) -> None:
         super()._unregister()
-        GameState.buildings["noncritical"].remove(self)
+        del GameState.buildings["noncritical"][self]
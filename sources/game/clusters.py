@@ -0,0 +1,382 @@
+import heapq
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from math import inf
+
+from game.spatial import get_diamond_offsets
+from game.states import GameState
+
+# Side of the square blocks of tiles the board is divided into. Each block is only
+# ever searched on its own, and the graph searched across the board only holds the
+# tiles where paths cross from one block into the next.
+CLUSTER_DIMENSION = 8
+
+# A run of crossable tile pairs along a border at least this long gets a transition
+# at each of its ends, a shorter one a single transition in its middle.
+_LONG_ENTRANCE_LENGTH = 6
+
+
+class ClusterGraph:
+    """
+    An abstract graph of the board within boundaries for units with mobility, in
+    the manner of HPA*. The board is divided into clusters, transitions are placed
+    where paths can cross from a cluster into the next, and the cheapest cost
+    between every two transitions of a cluster is precomputed. The graph is updated
+    incrementally, only the clusters around tiles whose cost or hostile occupancy
+    changed being searched again.
+    """
+
+    def __init__(
+        self,
+        mobility: int,
+        boundaries: tuple[int, int, int, int],
+        node_count_by_search: Counter,
+    ) -> None:
+        self._mobility = mobility
+        self._boundaries = boundaries
+        self._node_count_by_search = node_count_by_search
+
+        x_min, x_max, y_min, y_max = boundaries
+        self._column_count = (x_max - x_min) // CLUSTER_DIMENSION + 1
+        self._row_count = (y_max - y_min) // CLUSTER_DIMENSION + 1
+
+        # The board as of the last update
+        self._cost_by_coordinate = {}
+        self._blocked_coordinates = frozenset()
+        self._revisions = None
+
+        self._transition_pairs_by_border = {}
+        self._transitions_by_cluster = {}
+        self._edges_by_cluster = {}
+        self._predecessors_by_transition = None
+
+    # SET
+    def update(self, blocked_coordinates: Mapping[tuple[int, int], object], revisions: tuple[int, int]) -> None:
+        """
+        Bring the graph up to date with the board, where units cannot step on
+        blocked_coordinates, as of revisions (the cost and hostile revisions).
+        """
+        if revisions == self._revisions:
+            return
+
+        x_min, x_max, y_min, y_max = self._boundaries
+        changed_coordinates = set()
+
+        if self._revisions is None or revisions[0] != self._revisions[0]:
+            for y in range(y_min, y_max + 1):
+                for x in range(x_min, x_max + 1):
+                    cost = GameState.cost_by_coordinate.get((x, y))
+                    if cost != self._cost_by_coordinate.get((x, y)):
+                        self._cost_by_coordinate[(x, y)] = cost
+                        changed_coordinates.add((x, y))
+
+        if self._revisions is None:
+            # Every cluster is built the first time, whether or not its tiles changed.
+            changed_coordinates.update(
+                (x_min + i * CLUSTER_DIMENSION, y_min + j * CLUSTER_DIMENSION)
+                for i in range(self._column_count)
+                for j in range(self._row_count)
+            )
+
+        blocked_coordinates = frozenset(
+            (x, y) for x, y in blocked_coordinates if x_min <= x <= x_max and y_min <= y <= y_max
+        )
+        changed_coordinates.update(blocked_coordinates ^ self._blocked_coordinates)
+        self._blocked_coordinates = blocked_coordinates
+        self._revisions = revisions
+
+        # A change within a cluster can move the transitions on any of its borders,
+        # and the neighbor across a border whose transitions moved must be relinked.
+        dirty_clusters = {self._get_cluster(coordinate) for coordinate in changed_coordinates}
+        clusters_to_link = set(dirty_clusters)
+
+        for border in {border for cluster in dirty_clusters for border in self._get_borders(cluster)}:
+            transition_pairs = self._get_transition_pairs(*border)
+            if transition_pairs != self._transition_pairs_by_border.get(border):
+                self._transition_pairs_by_border[border] = transition_pairs
+                clusters_to_link.update(border)
+
+        for cluster in clusters_to_link:
+            self._link(cluster)
+
+        if clusters_to_link:
+            self._predecessors_by_transition = None
+
+    # GET
+    def get_distance_field(self, target: tuple[int, int], attack_range: int) -> "ClusterField":
+        """
+        Return the cost for a unit to move from every tile until target is within
+        attack_range, following the abstract graph between clusters.
+        """
+        return ClusterField(self, target, attack_range)
+
+    def get_cluster(self, coordinate: tuple[int, int]) -> tuple[int, int]:
+        return self._get_cluster(coordinate)
+
+    def get_clusters(self) -> list[tuple[int, int]]:
+        return [(i, j) for j in range(self._row_count) for i in range(self._column_count)]
+
+    def get_transitions(self, cluster: tuple[int, int]) -> tuple[tuple[int, int], ...]:
+        return self._transitions_by_cluster.get(cluster, ())
+
+    def get_transition_costs(self, cost_by_seed: dict[tuple[int, int], int]) -> dict[tuple[int, int], int]:
+        """
+        Use reverse Dijkstra over the abstract graph to compute the cheapest cost to
+        move from every transition to any of the seed transitions, plus the cost of
+        that seed.
+        """
+        predecessors_by_transition = self._get_predecessors()
+
+        frontier = [(cost, seed) for seed, cost in cost_by_seed.items()]
+        heapq.heapify(frontier)
+        cost_table = dict(cost_by_seed)
+
+        while frontier:
+            cost_so_far, current = heapq.heappop(frontier)
+
+            if cost_so_far > cost_table[current]:
+                continue
+
+            for predecessor, cost in predecessors_by_transition.get(current, ()):
+                new_cost = cost_so_far + cost
+                if new_cost < cost_table.get(predecessor, inf):
+                    heapq.heappush(frontier, (new_cost, predecessor))
+                    cost_table[predecessor] = new_cost
+
+        self._node_count_by_search["cluster_graph"] += len(cost_table)
+        return cost_table
+
+    def is_within(self, coordinate: tuple[int, int]) -> bool:
+        x_min, x_max, y_min, y_max = self._boundaries
+        return x_min <= coordinate[0] <= x_max and y_min <= coordinate[1] <= y_max
+
+    def is_blocked(self, coordinate: tuple[int, int]) -> bool:
+        return coordinate in self._blocked_coordinates
+
+    def search(
+        self,
+        cluster: tuple[int, int],
+        cost_by_seed: dict[tuple[int, int], int],
+        reverse: bool,
+        search_name: str,
+    ) -> dict[tuple[int, int], int]:
+        """
+        Use Dijkstra, confined to cluster, to compute the cheapest cost from the seeds
+        to every tile of cluster, each seed starting at its cost. When reverse, the
+        costs are those of moving from every tile to the seeds instead, so the step
+        cost paid is that of the tile stepped from.
+        """
+        x_start, x_stop, y_start, y_stop = self._get_cluster_bounds(cluster)
+        blocked_coordinates = self._blocked_coordinates
+
+        frontier = [(cost, seed) for seed, cost in cost_by_seed.items()]
+        heapq.heapify(frontier)
+        cost_table = dict(cost_by_seed)
+
+        while frontier:
+            cost_so_far, current = heapq.heappop(frontier)
+
+            if cost_so_far > cost_table[current]:
+                continue
+
+            if reverse:
+                step_cost = self._get_step_cost(current)
+
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+                neighbor = x, y = current[0] + dx, current[1] + dy
+
+                if x_start <= x < x_stop and y_start <= y < y_stop and neighbor not in blocked_coordinates:
+                    if not reverse:
+                        step_cost = self._get_step_cost(neighbor)
+
+                    new_cost = cost_so_far + step_cost
+
+                    if new_cost < cost_table.get(neighbor, inf):
+                        heapq.heappush(frontier, (new_cost, neighbor))
+                        cost_table[neighbor] = new_cost
+
+        self._node_count_by_search[search_name] += len(cost_table)
+        return cost_table
+
+    def _get_predecessors(self) -> dict[tuple[int, int], list[tuple[tuple[int, int], int]]]:
+        """
+        Return, for every transition, the transitions with an edge toward it and the
+        edge's cost.
+        """
+        if self._predecessors_by_transition is None:
+            predecessors_by_transition = {}
+
+            for transition_pairs in self._transition_pairs_by_border.values():
+                for a, b in transition_pairs:
+                    predecessors_by_transition.setdefault(b, []).append((a, self._get_step_cost(b)))
+                    predecessors_by_transition.setdefault(a, []).append((b, self._get_step_cost(a)))
+
+            for edges_by_transition in self._edges_by_cluster.values():
+                for source, edges in edges_by_transition.items():
+                    for destination, cost in edges:
+                        predecessors_by_transition.setdefault(destination, []).append((source, cost))
+
+            self._predecessors_by_transition = predecessors_by_transition
+
+        return self._predecessors_by_transition
+
+    def _get_cluster(self, coordinate: tuple[int, int]) -> tuple[int, int]:
+        x_min, _, y_min, _ = self._boundaries
+        return (coordinate[0] - x_min) // CLUSTER_DIMENSION, (coordinate[1] - y_min) // CLUSTER_DIMENSION
+
+    def _get_cluster_bounds(self, cluster: tuple[int, int]) -> tuple[int, int, int, int]:
+        """
+        Return the x and y ranges of the tiles of cluster, as x_start, x_stop,
+        y_start, y_stop.
+        """
+        x_min, x_max, y_min, y_max = self._boundaries
+        x_start = x_min + cluster[0] * CLUSTER_DIMENSION
+        y_start = y_min + cluster[1] * CLUSTER_DIMENSION
+        return (
+            x_start,
+            min(x_max + 1, x_start + CLUSTER_DIMENSION),
+            y_start,
+            min(y_max + 1, y_start + CLUSTER_DIMENSION),
+        )
+
+    def _get_borders(self, cluster: tuple[int, int]) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """
+        Return the borders of cluster with each of its neighbors, each as the pair of
+        clusters in reading order.
+        """
+        i, j = cluster
+        borders = []
+
+        if i > 0:
+            borders.append(((i - 1, j), cluster))
+        if j > 0:
+            borders.append(((i, j - 1), cluster))
+        if i < self._column_count - 1:
+            borders.append((cluster, (i + 1, j)))
+        if j < self._row_count - 1:
+            borders.append((cluster, (i, j + 1)))
+
+        return borders
+
+    def _get_transition_pairs(
+        self,
+        first: tuple[int, int],
+        second: tuple[int, int],
+    ) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+        """
+        Return the adjacent tiles, one on each side of the border between first and
+        second, where paths cross it. Every run of tiles crossable side by side gets
+        one such pair in its middle, or one at each end when it is long.
+        """
+        x_start, x_stop, y_start, y_stop = self._get_cluster_bounds(first)
+
+        if second[0] > first[0]:
+            pairs = [((x_stop - 1, y), (x_stop, y)) for y in range(y_start, y_stop)]
+        else:
+            pairs = [((x, y_stop - 1), (x, y_stop)) for x in range(x_start, x_stop)]
+
+        transition_pairs = []
+        run = []
+
+        for pair in (*pairs, None):
+            if pair and pair[0] not in self._blocked_coordinates and pair[1] not in self._blocked_coordinates:
+                run.append(pair)
+                continue
+
+            if len(run) >= _LONG_ENTRANCE_LENGTH:
+                transition_pairs.extend((run[0], run[-1]))
+            elif run:
+                transition_pairs.append(run[len(run) // 2])
+            run = []
+
+        return transition_pairs
+
+    def _link(self, cluster: tuple[int, int]) -> None:
+        """
+        Gather the transitions of cluster and compute the cheapest cost between every
+        two of them within cluster.
+        """
+        transitions = []
+
+        for first, second in self._get_borders(cluster):
+            for a, b in self._transition_pairs_by_border.get((first, second), ()):
+                transition = a if first == cluster else b
+                if transition not in transitions:
+                    transitions.append(transition)
+
+        self._transitions_by_cluster[cluster] = tuple(transitions)
+        edges_by_transition = {}
+
+        for source in transitions:
+            cost_table = self.search(cluster, {source: 0}, reverse=False, search_name="cluster_graph")
+            edges_by_transition[source] = [
+                (destination, cost_table[destination])
+                for destination in transitions
+                if destination != source and destination in cost_table
+            ]
+
+        self._edges_by_cluster[cluster] = edges_by_transition
+
+    def _get_step_cost(self, coordinate: tuple[int, int]) -> int:
+        step_cost = self._cost_by_coordinate[coordinate]
+        return self._mobility if step_cost == -1 else step_cost
+
+
+class ClusterField(Mapping):
+    """
+    A read-only {(x, y): cost} mapping holding the cost to move from every tile
+    until target is within attack_range, as found through a ClusterGraph. The cost
+    from every transition is computed up front over the abstract graph, which is
+    small, while the cost from the tiles of a cluster is only computed, within that
+    cluster, the first time one of them is looked up.
+    """
+
+    def __init__(self, graph: ClusterGraph, target: tuple[int, int], attack_range: int) -> None:
+        self._graph = graph
+        self._goals_by_cluster = {}
+        self._cost_table_by_cluster = {}
+
+        for dx, dy in get_diamond_offsets(attack_range):
+            goal = target[0] + dx, target[1] + dy
+            if graph.is_within(goal) and not graph.is_blocked(goal):
+                self._goals_by_cluster.setdefault(graph.get_cluster(goal), {})[goal] = 0
+
+        # The abstract graph is entered from the transitions of each cluster holding
+        # goals, at their cost to reach those goals within that cluster.
+        cost_by_seed = {}
+
+        for cluster, goals in self._goals_by_cluster.items():
+            cost_table = graph.search(cluster, goals, reverse=True, search_name="distance_field")
+            for transition in graph.get_transitions(cluster):
+                if transition in cost_table:
+                    cost_by_seed[transition] = min(cost_table[transition], cost_by_seed.get(transition, inf))
+
+        self._cost_by_transition = graph.get_transition_costs(cost_by_seed)
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> int:
+        if self._graph.is_within(coordinate) and not self._graph.is_blocked(coordinate):
+            if (cost := self._get_cost_table(self._graph.get_cluster(coordinate)).get(coordinate)) is not None:
+                return cost
+
+        raise KeyError(coordinate)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        for cluster in self._graph.get_clusters():
+            yield from self._get_cost_table(cluster)
+
+    def __len__(self) -> int:
+        return sum(len(self._get_cost_table(cluster)) for cluster in self._graph.get_clusters())
+
+    def _get_cost_table(self, cluster: tuple[int, int]) -> dict[tuple[int, int], int]:
+        if (cost_table := self._cost_table_by_cluster.get(cluster)) is None:
+            cost_by_seed = {
+                transition: self._cost_by_transition[transition]
+                for transition in self._graph.get_transitions(cluster)
+                if transition in self._cost_by_transition
+            }
+            cost_by_seed.update(self._goals_by_cluster.get(cluster, {}))
+
+            cost_table = self._graph.search(cluster, cost_by_seed, reverse=True, search_name="distance_field")
+            self._cost_table_by_cluster[cluster] = cost_table
+
+        return cost_table
@@ -0,0 +1,56 @@
+from game.states import GameState
+
+
+class CommandLog:
+    """
+    Append every state-changing command of a game to a file, one line of
+    space-separated fields each, so that the game can be replayed. A game starts
+    with a seed line, after which the landscape and the waves follow from the
+    seed and only the player's commands need to be logged, along with how deep
+    the computer searched each of its decisions, which depends on timing:
+
+        seed 42
+        recruit infantry 9 5
+        move 10 7 11 7
+        assault 11 7 12 7
+        end
+        search 3 3 2 0
+    """
+
+    def __init__(self, path: str, seed: int) -> None:
+        # Line buffered, so a game is logged up to its last command even if it crashes
+        self._file = open(path, "a", buffering=1)
+        self.record("seed", seed)
+
+    def record(self, *fields: str | int) -> None:
+        self._file.write(" ".join(map(str, fields)) + "\n")
+
+    def close(self) -> None:
+        self._file.close()
+
+    @staticmethod
+    def read(path: str) -> list[tuple[int, list[list[str]]]]:
+        """
+        Return the seed and the commands of every game in the log at path.
+        """
+        games = []
+
+        with open(path) as file:
+            for line in file:
+                match line.split():
+                    case ["seed", seed]:
+                        games.append((int(seed), []))
+                    case []:
+                        pass
+                    case command:
+                        games[-1][1].append(command)
+
+        return games
+
+
+def record(*fields: str | int) -> None:
+    """
+    Append a command to the game's log, if it is being logged.
+    """
+    if log := GameState.command_log:
+        log.record(*fields)
@@ -33,7 +33,8 @@ class DisplayOutcomeControlView(GameObjectView):
         )
 
     def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
-        self._widgets["main"].configure(
+        self._configure_widget(
+            "main",
             command=event_handlers["click"],
             text=data["text"],
         )
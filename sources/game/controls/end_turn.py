@@ -1,50 +1,77 @@
 import tkinter as tk
-from collections.abc import Callable, Iterator
-from functools import wraps
+from collections import Counter
+from collections.abc import Callable
+from functools import partial, wraps
 from math import ceil
-from random import choice, sample
 from tkinter import ttk
 
+from game import instrumentation, pathfinding, soldiers
+from game.animations import when_idle
 from game.base import GameObject, GameObjectModel, GameObjectView
 from game.buildings.base import Building
+from game.commands import record
 from game.configurations import Color, Dimension
 from game.controls.display_outcome import DisplayOutcomeControl
+from game.influence import InfluenceMap
+from game.lookahead import TurnSearch
 from game.recruitments.base import SoldierRecruitment
 from game.soldiers import Archer, Cavalry, Infantry
-from game.soldiers.base import Soldier
+from game.soldiers.base import HuntAction, Soldier
 from game.states import Environment, GameState
-from game.utilities import msleep
 
 
 def block_user_input_during(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
+        if Environment.headless:
+            return func(self, *args, **kwargs)
+
         overlay = tk.Toplevel(self.view.canvas.master)
         overlay.wm_geometry(f"{Environment.screen_width}x{Environment.screen_height}+0+0")
 
+        def run() -> None:
+            func(self, *args, **kwargs)
+            # Keep blocking until the animations queued by func have played.
+            when_idle(overlay.destroy)
+
+        def handle_visibility_event(event: tk.Event) -> None:
+            overlay.unbind("<Visibility>")
+            overlay.wm_attributes("-alpha", 0.01, "-topmost", 1)
+
+            # Wait until the overlay becomes transparent.
+            overlay.after(20, run)
+
         match Environment.windowing_system:
             case "win32":
                 overlay.wm_attributes("-alpha", 0.01, "-disabled", 1, "-topmost", 1)
                 overlay.wm_overrideredirect(True)
+                run()
             case "x11":
                 overlay.wm_overrideredirect(True)
-                overlay.wait_visibility()
-                overlay.wm_attributes("-alpha", 0.01, "-topmost", 1)
-
-                # Wait until the overlay becomes transparent.
-                msleep(self.view.canvas.master, 20)
-
-        value = func(self, *args, **kwargs)
-
-        overlay.destroy()
-
-        return value
+                overlay.bind("<Visibility>", handle_visibility_event)
+            case _:
+                run()
 
     return wrapper
 
 
 class EndTurnControlModel(GameObjectModel):
-    pass
+
+    def __init__(self, x: int, y: int) -> None:
+        super().__init__(x, y)
+        # Days cycle through 3 phases: healing, a new wave, then income and healing.
+        self.day_phase = 0
+        self.first_wave_names: list[str] = []
+        self.victorious = False
+
+    def get_data(self) -> dict:
+        data = {
+            **super().get_data(),
+            "day_phase": self.day_phase,
+            "first_wave_names": self.first_wave_names,
+            "victorious": self.victorious,
+        }
+        return data
 
 
 class EndTurnControlView(GameObjectView):
@@ -59,15 +86,14 @@ class EndTurnControlView(GameObjectView):
         )
 
     def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
-        self._widgets["main"].configure(command=event_handlers["click"])
+        self._configure_widget("main", command=event_handlers["click"])
 
 
 class EndTurnControl(GameObject):
 
-    def __init__(self, model: EndTurnControlModel, view: EndTurnControlView) -> None:
-        self._day_generator_iterator = self._day_generator_function()
-        self._wave_generator_iterator = self._wave_generator_function()
-        super().__init__(model, view)
+    # Seconds the red soldiers may spend searching ahead for their actions each
+    # turn, beyond which each soldier left acts greedily
+    computer_turn_budget = 0.1
 
     def _register(self) -> None:
         GameState.controls["end_turn"] = self
@@ -80,7 +106,13 @@ class EndTurnControl(GameObject):
         return {"click": self.handle_click_event}
 
     @block_user_input_during
-    def handle_click_event(self) -> None:
+    def handle_click_event(self, search_depths: list[int] | None = None) -> None:
+        """
+        End the player's turn and play the computer's. A replay passes the
+        search_depths logged for the turn, so that the computer plans it as it did.
+        """
+        record("end")
+
         match GameState.selected_game_objects:
             case [Building(), SoldierRecruitment() as recruitment]:
                 recruitment.handle_click_event()
@@ -91,63 +123,120 @@ class EndTurnControl(GameObject):
                 soldier.model.attacked_this_turn = False
                 soldier.refresh()
 
-            self._execute_computer_turn()
+            self._execute_computer_turn(search_depths)
         else:
-            next(self._day_generator_iterator)
+            self._advance_day()
 
         for soldier in GameState.soldiers["blue"]:
             soldier.model.moved_this_turn = False
             soldier.model.attacked_this_turn = False
             soldier.refresh()
 
-    def _execute_computer_turn(self) -> None:
-        if not GameState.soldiers["blue"] and not GameState.buildings["critical"]:
-            DisplayOutcomeControl.create(
-                {"text": "You have been defeated."},
-                {"canvas": self.view.canvas},
+        if instrumentation.ENABLED:
+            instrumentation.end_turn(
+                len(GameState.soldiers["blue"]) + len(GameState.soldiers["red"]),
+                pathfinding.node_count_by_search.total(),
             )
+            if display := GameState.displays["performance"]:
+                display.refresh()
+
+        if GameState.autosave:
+            GameState.autosave.save()
+
+    def _execute_computer_turn(self, search_depths: list[int] | None) -> None:
+        if not GameState.soldiers["blue"] and not GameState.buildings["critical"]:
+            self._display_outcome("You have been defeated.")
             return
 
-        for soldier in GameState.soldiers["red"]:
-            soldier.hunt()
+        actions = self._plan_computer_turn(search_depths)
+        self._play_computer_turn(actions)
+
+        if not GameState.soldiers["blue"] and not GameState.buildings["critical"]:
+            self._display_outcome("You have been defeated.")
+
+    def _plan_computer_turn(self, search_depths: list[int] | None) -> list[HuntAction]:
+        """
+        Decide and execute the action of every red soldier on the models, before
+        any of it is shown. The soldiers act in the order the search finds best,
+        within computer_turn_budget, or as deep as search_depths if given. How deep
+        each decision was searched is logged, since it depends on timing.
+        """
+        actions = []
+        GameState.influence_map = InfluenceMap()
+        search = TurnSearch(self.computer_turn_budget, depths=search_depths)
+        red_soldiers = list(GameState.soldiers["red"])
+
+        while red_soldiers:
+            action = search.plan_hunt(red_soldiers)
+            action.soldier.execute(action)
+            red_soldiers.remove(action.soldier)
+            actions.append(action)
 
             if not GameState.soldiers["blue"] and not GameState.buildings["critical"]:
-                DisplayOutcomeControl.create(
-                    {"text": "You have been defeated."},
-                    {"canvas": self.view.canvas},
-                )
                 break
 
-    def _day_generator_function(self) -> Iterator[None]:
-        while True:
-            GameState.displays["day"].model.day += 1
-            GameState.displays["day"].refresh()
-            for soldier in GameState.soldiers["blue"]:
-                soldier.restore_health_by(10.0)
-            yield
-
-            GameState.displays["day"].model.day += 1
-            GameState.displays["day"].refresh()
-            try:
-                next(self._wave_generator_iterator)
-                yield
-            except StopIteration:
-                while True:
-                    DisplayOutcomeControl.create(
-                        {"text": "Victory is yours!"},
-                        {"canvas": self.view.canvas},
-                    )
-                    yield
-
-            GameState.displays["day"].model.day += 1
-            GameState.displays["day"].refresh()
-            GameState.displays["coin"].model.coin += 8 + (GameState.wave * 2)
-            GameState.displays["coin"].refresh()
-            for soldier in GameState.soldiers["blue"]:
-                soldier.restore_health_by(10.0)
-            yield
-
-    def _wave_generator_function(self) -> Iterator[None]:
+        record("search", *search.depths)
+        return actions
+
+    def _play_computer_turn(self, actions: list[HuntAction]) -> None:
+        """
+        Show actions in order. As they have all been executed already, the health of
+        a target right after an action is its current health plus the damage dealt
+        to it by the later actions.
+        """
+        damage_to_come = Counter()
+        for action in actions:
+            damage_to_come[action.target] += action.damage
+
+        for action in actions:
+            damage_to_come[action.target] -= action.damage
+
+            if action.kill:
+                target_data = None
+            else:
+                target_data = action.target.model.get_data()
+                target_data["health"] += damage_to_come[action.target]
+
+            action.soldier.play(action, target_data)
+
+    def _display_outcome(self, text: str) -> None:
+        # Show the banner once the animations leading to the outcome have played.
+        when_idle(partial(DisplayOutcomeControl.create, {"text": text}, {"canvas": self.view.canvas}))
+
+    def _advance_day(self) -> None:
+        """
+        Move on to the next day. Every step is kept on the model, rather than in a
+        generator, so that a saved game can resume where it was.
+        """
+        if self.model.victorious:
+            self._display_outcome("Victory is yours!")
+            return
+
+        GameState.displays["day"].model.day += 1
+        GameState.displays["day"].refresh()
+
+        match self.model.day_phase:
+            case 0:
+                for soldier in GameState.soldiers["blue"]:
+                    soldier.restore_health_by(10.0)
+            case 1:
+                if not self._spawn_next_wave():
+                    self.model.victorious = True
+                    self._display_outcome("Victory is yours!")
+                    return
+            case 2:
+                GameState.displays["coin"].model.coin += 8 + (GameState.wave * 2)
+                GameState.displays["coin"].refresh()
+                for soldier in GameState.soldiers["blue"]:
+                    soldier.restore_health_by(10.0)
+
+        self.model.day_phase = (self.model.day_phase + 1) % 3
+
+    def _spawn_next_wave(self) -> bool:
+        """
+        Spawn the next wave of red soldiers. Return False once every wave has been
+        spawned.
+        """
         H = Dimension.HORIZONTAL_FIELD_TILE_COUNT
         V = Dimension.VERTICAL_TILE_COUNT
         area_north_east = [
@@ -169,26 +258,30 @@ class EndTurnControl(GameObject):
 
         def sample_n_coordinates_from_m_areas(n: int, m: int) -> list[tuple[int, int]]:
             coordinates = []
-            for area in sample(
+            for area in GameState.rng.sample(
                 [area_north_east, area_north_west, area_south_east, area_south_west], m
             ):
                 coordinates.extend(area)
-            return sample(coordinates, n)
+            return GameState.rng.sample(coordinates, n)
 
         def sample_common_soldiers() -> type[Soldier]:
-            return choice([Archer, Cavalry, Infantry])
+            return GameState.rng.choice([Archer, Cavalry, Infantry])
+
+        # The first 3 waves bring one of each common soldier, then waves grow by 2.
+        if GameState.wave < 3:
+            if not self.model.first_wave_names:
+                self.model.first_wave_names = [
+                    soldier_class.__name__ for soldier_class in GameState.rng.sample([Archer, Cavalry, Infantry], 3)
+                ]
 
-        common_soldiers = {Archer, Cavalry, Infantry}
-        while common_soldiers:
+            common_soldier = getattr(soldiers, self.model.first_wave_names[GameState.wave])
             GameState.wave += 1
             [(x, y)] = sample_n_coordinates_from_m_areas(1, 1)
-            common_soldiers.pop().create(
+            common_soldier.create(
                 {"x": x, "y": y, "color": Color.RED},
                 {"canvas": self.view.canvas},
             )
-            yield
-
-        for n in range(2, 18 + 1, 2):
+        elif (n := 2 * (GameState.wave - 2)) <= 18:
             m = ceil(n / 6)
             GameState.wave += 1
             for x, y in sample_n_coordinates_from_m_areas(n, m):
@@ -196,4 +289,7 @@ class EndTurnControl(GameObject):
                     {"x": x, "y": y, "color": Color.RED},
                     {"canvas": self.view.canvas},
                 )
-            yield
+        else:
+            return False
+
+        return True
@@ -1,4 +1,5 @@
 from game.displays.coin import CoinDisplay
 from game.displays.day import DayDisplay
+from game.displays.performance import PerformanceDisplay
 from game.displays.production import ProductionDisplay
 from game.displays.stat import StatDisplay
@@ -21,7 +21,7 @@ class CoinDisplayModel(DisplayModel):
 class CoinDisplayView(DisplayView):
 
     def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
-        self._widgets["main"].configure(text=f"Coin: {data["coin"]:3d}")
+        self._configure_widget("main", text=f"Coin: {data["coin"]:3d}")
 
 
 class CoinDisplay(Display):
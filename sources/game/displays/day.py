@@ -21,7 +21,7 @@ class DayDisplayModel(DisplayModel):
 class DayDisplayView(DisplayView):
 
     def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
-        self._widgets["main"].configure(text=f"Day:  {data["day"]:3d}")
+        self._configure_widget("main", text=f"Day:  {data["day"]:3d}")
 
 
 class DayDisplay(Display):
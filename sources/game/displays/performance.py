@@ -0,0 +1,80 @@
+from collections.abc import Callable
+from tkinter import ttk
+
+from game import instrumentation
+from game.displays.base import Display, DisplayModel, DisplayView
+from game.states import GameState
+
+LABEL_BY_NAME = {
+    "reachable_coordinates": "REACH",
+    "approaching_path": "PATH",
+    "hunt": "HUNT",
+    "lookahead": "LOOK",
+    "refresh": "REFRESH",
+    "create": "CREATE",
+}
+
+
+class PerformanceDisplayModel(DisplayModel):
+    pass
+
+
+class PerformanceDisplayView(DisplayView):
+
+    def _create_widgets(self) -> None:
+        self._widgets["main"] = ttk.Label(
+            self.canvas,
+            cursor="arrow",
+            style="PerformancePanelBox.Black_CustomWood.TButton",
+        )
+
+    def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
+        if not data:
+            text = "LAST TURN\n\nNo turn yet."
+        else:
+            text = self._generate_stat(data)
+
+        self._configure_widget("main", text=text)
+
+    def _generate_stat(self, data: dict) -> str:
+        unit_count = max(data["unit_count"], 1)
+        lines = [
+            "LAST TURN",
+            f"UNITS:   {data["unit_count"]:9d}",
+            f"NODES:   {data["node_count"]:9d}",
+            "",
+            f"{"":<8}{"CALLS":>5}{"MS":>6}",
+        ]
+
+        for name, label in LABEL_BY_NAME.items():
+            lines.append(
+                f"{label:<8}{data["call_count_by_name"][name]:5d}{data["duration_by_name"][name] * 1000:6.1f}"
+            )
+
+        lines += ["", "MS PER UNIT"]
+        for name, label in LABEL_BY_NAME.items():
+            lines.append(f"{label:<8}{data["duration_by_name"][name] * 1000 / unit_count:11.2f}")
+
+        return "\n".join(lines)
+
+
+class PerformanceDisplay(Display):
+    """
+    An overlay on the side panel showing where the last turn's time went, toggled
+    on and off. It only has figures to show when instrumentation is enabled.
+    """
+
+    def refresh(self) -> None:
+        self.view.refresh(instrumentation.last_turn, self.event_handlers)
+
+    def toggle(self) -> None:
+        if self.view._ids:
+            self.view.detach_widgets()
+        else:
+            self.view.attach_widgets(self.model.get_data())
+
+    def _register(self) -> None:
+        GameState.displays["performance"] = self
+
+    def _unregister(self) -> None:
+        GameState.displays["performance"] = None
@@ -26,7 +26,7 @@ class StatDisplayView(DisplayView):
             case _:
                 text = ""
 
-        self._widgets["main"].configure(text=text)
+        self._configure_widget("main", text=text)
 
     def _generate_building_stat(self, data: dict) -> str:
         data = data.copy()
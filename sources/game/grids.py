@@ -0,0 +1,234 @@
+from collections.abc import Iterator, Mapping
+
+from game.configurations import Color, Dimension
+from game.spatial import get_diamond_offsets
+from game.states import GameState
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Step cost standing in for tiles that cannot be entered, large enough that any
+# cost going through such a tile is recognizable, yet small enough to stay exact.
+_BLOCKED = 1e9
+
+
+class ArrayField(Mapping):
+    """
+    A read-only {(x, y): cost} mapping over a window of a cost array, leaving out
+    unreachable tiles.
+    """
+
+    def __init__(self, array: "np.ndarray", x_offset: int, y_offset: int) -> None:
+        self._array = array
+        self._x_offset = x_offset
+        self._y_offset = y_offset
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> int:
+        i = coordinate[1] - self._y_offset
+        j = coordinate[0] - self._x_offset
+
+        if 0 <= i < self._array.shape[0] and 0 <= j < self._array.shape[1]:
+            if (value := self._array[i, j]) < _BLOCKED:
+                return int(value)
+
+        raise KeyError(coordinate)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        ys, xs = np.nonzero(self._array < _BLOCKED)
+        for x, y in zip((xs + self._x_offset).tolist(), (ys + self._y_offset).tolist()):
+            yield x, y
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._array < _BLOCKED))
+
+
+class Grid:
+    """
+    The board as NumPy planes indexed by [y, x]: step costs, obstacles, and the
+    occupancy of each side.
+    """
+
+    def __init__(self) -> None:
+        shape = (Dimension.VERTICAL_TILE_COUNT, Dimension.HORIZONTAL_FIELD_TILE_COUNT)
+        self.cost = np.ones(shape, dtype=np.int16)
+        self.obstacle = np.zeros(shape, dtype=bool)
+        self.occupancy = {
+            Color.BLUE: np.zeros(shape, dtype=bool),
+            Color.RED: np.zeros(shape, dtype=bool),
+        }
+
+        for coordinate, cost in GameState.cost_by_coordinate.items():
+            self.set_cost(coordinate, cost)
+
+        for coordinate in GameState.blue_unit_by_coordinate:
+            self.occupy(Color.BLUE, coordinate)
+
+        for coordinate in GameState.red_unit_by_coordinate:
+            self.occupy(Color.RED, coordinate)
+
+    @classmethod
+    def create(cls) -> "Grid | None":
+        """
+        Return a grid mirroring the current board, or None when NumPy is unavailable.
+        """
+        if np is None:
+            return None
+
+        return cls()
+
+    # SET
+    def set_cost(self, coordinate: tuple[int, int], cost: int) -> None:
+        x, y = coordinate
+        self.cost[y, x] = cost
+        self.obstacle[y, x] = cost == -1
+
+    def occupy(self, color: str, coordinate: tuple[int, int]) -> None:
+        x, y = coordinate
+        self.occupancy[color][y, x] = True
+
+    def vacate(self, color: str, coordinate: tuple[int, int]) -> None:
+        x, y = coordinate
+        self.occupancy[color][y, x] = False
+
+    # GET
+    def get_reachable_coordinates(
+        self,
+        start: tuple[int, int],
+        mobility: int,
+        boundaries: tuple[int, int, int, int],
+        color: str,
+    ) -> set[tuple[int, int]]:
+        """
+        Flood fill from start with a budget of mobility and return every coordinate a
+        unit of color can end its move on.
+        """
+        x_min, x_max, y_min, y_max = boundaries
+        x, y = start
+
+        # Nothing further than mobility tiles away can be reached.
+        window = (
+            slice(max(y_min, y - mobility), min(y_max, y + mobility) + 1),
+            slice(max(x_min, x - mobility), min(x_max, x + mobility) + 1),
+        )
+        y0, x0 = window[0].start, window[1].start
+
+        entry_cost = self._get_step_costs(mobility, color, window)
+        cost = np.full(entry_cost.shape, np.inf)
+        cost[y - y0, x - x0] = 0.0
+        cost = self._sweep_until_stable(cost, entry_cost, reverse=False)
+
+        ys, xs = np.nonzero((cost <= mobility) & ~self.occupancy[color][window])
+        return set(zip((xs + x0).tolist(), (ys + y0).tolist()))
+
+    def get_distance_field(
+        self,
+        target: tuple[int, int],
+        attack_range: int,
+        mobility: int,
+        boundaries: tuple[int, int, int, int],
+        color: str,
+    ) -> ArrayField:
+        """
+        Return the cheapest cost for a unit of color to move from every tile until
+        target is within attack_range.
+        """
+        x_min, x_max, y_min, y_max = boundaries
+        window = (slice(y_min, y_max + 1), slice(x_min, x_max + 1))
+        blocked = self._get_hostile_occupancy(color)[window]
+
+        field = np.where(self.get_attack_range_mask(target, attack_range, window) & ~blocked, 0.0, np.inf)
+        field = self._sweep_until_stable(field, self._get_step_costs(mobility, color, window), reverse=True)
+        field[blocked] = np.inf
+
+        return ArrayField(field, x_min, y_min)
+
+    def get_attack_range_mask(
+        self,
+        center: tuple[int, int],
+        attack_range: int,
+        window: tuple[slice, slice] | None = None,
+    ) -> "np.ndarray":
+        """
+        Return a plane, cropped to window, marking every tile within attack_range of
+        center.
+        """
+        rows, columns = window or (slice(0, self.cost.shape[0]), slice(0, self.cost.shape[1]))
+        x, y = center
+        return (
+            np.abs(np.arange(rows.start, rows.stop) - y)[:, np.newaxis]
+            + np.abs(np.arange(columns.start, columns.stop) - x)[np.newaxis, :]
+        ) <= attack_range
+
+    def spread(self, units_by_radius: dict[int, list[tuple[tuple[int, int], float]]]) -> "np.ndarray":
+        """
+        Return a plane where every tile sums the weights of the units lying within
+        radius of it, by radius. Each kernel offset adds the whole plane of weights,
+        shifted, at once.
+        """
+        height, width = self.cost.shape
+        plane = np.zeros((height, width))
+
+        for radius, units in units_by_radius.items():
+            weight = np.zeros((height, width))
+            for (x, y), unit_weight in units:
+                weight[y, x] = unit_weight
+
+            for dx, dy in get_diamond_offsets(radius):
+                if abs(dx) < width and abs(dy) < height:
+                    plane[max(0, dy):height + min(0, dy), max(0, dx):width + min(0, dx)] += (
+                        weight[max(0, -dy):height - max(0, dy), max(0, -dx):width - max(0, dx)]
+                    )
+
+        return plane
+
+    def _get_hostile_occupancy(self, color: str) -> "np.ndarray":
+        return self.occupancy[Color.RED if color == Color.BLUE else Color.BLUE]
+
+    def _get_step_costs(self, mobility: int, color: str, window: tuple[slice, slice]) -> "np.ndarray":
+        step_cost = np.where(self.obstacle[window], float(mobility), self.cost[window].astype(float))
+        step_cost[self._get_hostile_occupancy(color)[window]] = _BLOCKED
+        return step_cost
+
+    @staticmethod
+    def _sweep_until_stable(cost: "np.ndarray", entry_cost: "np.ndarray", reverse: bool) -> "np.ndarray":
+        """
+        Relax cost in place along rows and columns, in both directions, until it
+        stops changing. Each sweep is a running minimum over cost minus the
+        cumulative step costs, so a whole straight run of tiles is relaxed at once.
+        When reverse, cost holds the cost to reach a goal from each tile, so the step
+        cost paid is that of the neighbor rather than that of the tile.
+        """
+        sweeps = []
+
+        for axis in (0, 1):
+            for direction in (1, -1):
+                index = [slice(None), slice(None)]
+                index[axis] = slice(None, None, direction)
+                index = tuple(index)
+
+                step_cost = entry_cost[index]
+                if reverse:
+                    # Entering the previous tile along the sweep from the current one
+                    shifted = np.zeros_like(step_cost)
+                    if axis == 0:
+                        shifted[1:, :] = step_cost[:-1, :]
+                    else:
+                        shifted[:, 1:] = step_cost[:, :-1]
+                    step_cost = shifted
+
+                sweeps.append((axis, index, np.cumsum(step_cost, axis=axis)))
+
+        while True:
+            previous = cost.copy()
+
+            for axis, index, cumulative in sweeps:
+                view = cost[index]
+                np.minimum(view, np.minimum.accumulate(view - cumulative, axis=axis) + cumulative, out=view)
+
+            if np.array_equal(cost, previous):
+                break
+
+        cost[cost >= _BLOCKED] = np.inf
+        return cost
@@ -1,4 +1,5 @@
-from game.base import GameObject, GameObjectModel, GameObjectView
+from game.base import GameObject, GameObjectModel
+from game.highlights.base import ItemPool, PooledHighlightView
 from game.images import Image
 from game.states import GameState
 from game.utilities import get_pixels
@@ -18,19 +19,13 @@ class AttackRangeHighlightModel(GameObjectModel):
         return data
 
 
-class AttackRangeHighlightView(GameObjectView):
+class AttackRangeHighlightView(PooledHighlightView):
 
-    def _create_widgets(self) -> None:
-        pass
+    pool = ItemPool(lambda canvas: canvas.create_image(0, 0))
 
-    def _destroy_widgets(self) -> None:
-        pass
-
-    def attach_widgets(self, data: dict) -> None:
-        self._ids["main"] = self.canvas.create_image(
-            *get_pixels(data["x"], data["y"]),
-            image=getattr(Image, "red_diamond_{0}x{0}".format(data["half_diagonal"] * 120)),
-        )
+    def _place(self, id_: int, data: dict) -> None:
+        self.canvas.coords(id_, *get_pixels(data["x"], data["y"]))
+        self.canvas.itemconfigure(id_, image=getattr(Image, "red_diamond_{0}x{0}".format(data["half_diagonal"] * 120)))
 
 
 class AttackRangeHighlight(GameObject):
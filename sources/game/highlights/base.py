@@ -0,0 +1,58 @@
+import tkinter as tk
+from abc import abstractmethod
+from collections.abc import Callable
+
+from game.base import GameObjectView
+
+
+class ItemPool:
+    """
+    Canvas items of one kind, hidden rather than deleted when released, so that a
+    highlight reuses an item instead of creating one. The pool grows to the most
+    items ever shown at once, then stays that size.
+    """
+
+    def __init__(self, create: Callable[[tk.Canvas], int]) -> None:
+        self._create = create
+        self._free_ids_by_canvas: dict[tk.Canvas, list[int]] = {}
+
+    def acquire(self, canvas: tk.Canvas) -> int:
+        if free_ids := self._free_ids_by_canvas.setdefault(canvas, []):
+            return free_ids.pop()
+
+        return self._create(canvas)
+
+    def release(self, canvas: tk.Canvas, id_: int) -> None:
+        canvas.itemconfigure(id_, state=tk.HIDDEN)
+        self._free_ids_by_canvas[canvas].append(id_)
+
+
+class PooledHighlightView(GameObjectView):
+    """
+    A highlight drawn with a single canvas item taken from the pool of its class,
+    which is moved into place and shown when attached, and hidden when detached.
+    """
+
+    pool: ItemPool
+
+    def _create_widgets(self) -> None:
+        pass
+
+    def _destroy_widgets(self) -> None:
+        pass
+
+    def attach_widgets(self, data: dict) -> None:
+        self._ids["main"] = id_ = self.pool.acquire(self.canvas)
+        self._place(id_, data)
+        self.canvas.itemconfigure(id_, state=tk.NORMAL)
+        self._lower_below_units(id_)
+
+    def detach_widgets(self) -> None:
+        for id_ in self._ids.values():
+            self.pool.release(self.canvas, id_)
+        self._ids.clear()
+        self._item_options.clear()
+
+    @abstractmethod
+    def _place(self, id_: int, data: dict) -> None:
+        raise NotImplementedError
@@ -1,4 +1,5 @@
-from game.base import GameObject, GameObjectModel, GameObjectView
+from game.base import GameObject, GameObjectModel
+from game.highlights.base import ItemPool, PooledHighlightView
 from game.states import GameState
 from game.utilities import get_pixels
 
@@ -7,21 +8,13 @@ class MovementHighlightModel(GameObjectModel):
     pass
 
 
-class MovementHighlightView(GameObjectView):
+class MovementHighlightView(PooledHighlightView):
 
-    def _create_widgets(self) -> None:
-        pass
+    pool = ItemPool(lambda canvas: canvas.create_rectangle(0, 0, 0, 0, fill="RoyalBlue1", width=0))
 
-    def _destroy_widgets(self) -> None:
-        pass
-
-    def attach_widgets(self, data: dict) -> None:
+    def _place(self, id_: int, data: dict) -> None:
         x, y = get_pixels(data["x"], data["y"])
-        self._ids["main"] = self.canvas.create_rectangle(
-            x - 6, y - 6, x + 7, y + 7,
-            fill="RoyalBlue1",
-            width=0,
-        )
+        self.canvas.coords(id_, x - 6, y - 6, x + 7, y + 7)
 
 
 class MovementHighlight(GameObject):
@@ -2,7 +2,7 @@ from collections.abc import Callable
 from tkinter import ttk
 
 from game.base import GameObject, GameObjectModel, GameObjectView
-from game.configurations import Color
+from game.commands import record
 from game.images import Image
 from game.states import GameState
 
@@ -23,7 +23,7 @@ class PlacementHighlightView(GameObjectView):
         )
 
     def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
-        self._widgets["main"].configure(command=event_handlers["click"])
+        self._configure_widget("main", command=event_handlers["click"])
 
 
 class PlacementHighlight(GameObject):
@@ -41,26 +41,19 @@ class PlacementHighlight(GameObject):
     def handle_click_event(self) -> None:
         recruitment = GameState.selected_game_objects[-1]
 
-        GameState.displays["coin"].model.coin -= recruitment.target.get_model_class().cost
-        GameState.displays["coin"].refresh()
-
-        for _recruitment in GameState.recruitments["barrack"]:
-            _recruitment.refresh()
-
-        soldier = recruitment.target.create(
-            {
-                "x": self.model.x,
-                "y": self.model.y,
-                "color": Color.BLUE,
-            },
+        record("recruit", recruitment.target.__name__.lower(), self.model.x, self.model.y)
+        soldier = recruitment.target.recruit(
+            self.model.x,
+            self.model.y,
             {
                 "canvas": self.view.canvas,
                 "attach": False,
             },
         )
-        soldier.model.moved_this_turn = True
-        soldier.model.attacked_this_turn = True
-        soldier.refresh()
+
+        for _recruitment in GameState.recruitments["barrack"]:
+            _recruitment.refresh()
+
         data = soldier.model.get_data()
         soldier.view.attach_widgets(data)
 
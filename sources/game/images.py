@@ -1,13 +1,34 @@
 import tkinter as tk
 from pathlib import Path
 
+DIRECTORY = Path(__file__).resolve().parents[2] / "images"
 
-class Image:
+
+class _ImageRegistry(type):
+
+    def __getattr__(cls, name: str) -> tk.PhotoImage:
+        """
+        Decode the image called name on first access, then hook it onto cls so that
+        later accesses are plain attribute lookups.
+        """
+        try:
+            path = cls._path_by_name[name]
+        except KeyError:
+            raise AttributeError(f"There is no image called {name}.") from None
+
+        image = tk.PhotoImage(file=str(path))
+        setattr(cls, name, image)
+        return image
+
+
+class Image(metaclass=_ImageRegistry):
+
+    _path_by_name: dict[str, Path] = {}
 
     @classmethod
     def initialize(cls) -> None:
         """
-        Hook all images onto cls.
+        Index the images shipped with the game by name, leaving each to be decoded
+        the first time it is used.
         """
-        for path in Path("images").rglob("*.gif"):
-            setattr(cls, path.stem, tk.PhotoImage(file=str(path)))
+        cls._path_by_name = {path.stem: path for path in DIRECTORY.rglob("*.gif")}
@@ -0,0 +1,210 @@
+import heapq
+from collections.abc import Iterator, Mapping
+from functools import lru_cache
+from math import inf
+
+from game.spatial import get_diamond_offsets
+from game.states import GameState
+
+# Once a repair has settled this share of the field's tiles again, the field is
+# searched from scratch instead, which settles each tile once and more cheaply.
+_REPAIR_SHARE_LIMIT = 0.25
+
+
+class IncrementalField(Mapping):
+    """
+    A read-only {(x, y): cost} mapping holding the cost to move from every tile
+    until target is within attack_range, kept up to date with the board in the
+    manner of LPA*. Every tile keeps both its cost and the cost its neighbors imply
+    for it, so that when step costs or hostile units change, only the tiles whose
+    cost actually changes are searched again, rather than the whole board.
+    """
+
+    def __init__(
+        self,
+        target: tuple[int, int],
+        attack_range: int,
+        mobility: int,
+        boundaries: tuple[int, int, int, int],
+    ) -> None:
+        self._mobility = mobility
+        self._boundaries = boundaries
+
+        x_min, x_max, y_min, y_max = boundaries
+        self._goals = frozenset(
+            (target[0] + dx, target[1] + dy)
+            for dx, dy in get_diamond_offsets(attack_range)
+            if x_min <= target[0] + dx <= x_max and y_min <= target[1] + dy <= y_max
+        )
+
+        self._neighbors_by_coordinate = _get_neighbors_by_coordinate(boundaries)
+
+        # The board as of the last update
+        self._step_cost_by_coordinate = {}
+        self._blocked_coordinates = frozenset()
+        self._revisions = None
+
+        # The settled cost of every tile reaching the goals, the cost implied by its
+        # neighbors, and the tiles where the two disagree, by the lower of the two
+        self._cost_table = {}
+        self._lookahead_cost_table = {}
+        self._frontier = []
+
+    def __getitem__(self, coordinate: tuple[int, int]) -> int:
+        return self._cost_table[coordinate]
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return iter(self._cost_table)
+
+    def __len__(self) -> int:
+        return len(self._cost_table)
+
+    def update(self, blocked_coordinates: Mapping[tuple[int, int], object], revisions: tuple[int, int]) -> int:
+        """
+        Bring the field up to date with the board, where units cannot step on
+        blocked_coordinates, as of revisions (the cost and hostile revisions). Return
+        the number of tiles whose cost was settled again.
+        """
+        if revisions == self._revisions:
+            return 0
+
+        x_min, x_max, y_min, y_max = self._boundaries
+        changed_coordinates = set()
+
+        if self._revisions is None or revisions[0] != self._revisions[0]:
+            for coordinate in self._neighbors_by_coordinate:
+                step_cost = GameState.cost_by_coordinate.get(coordinate)
+                if step_cost == -1:
+                    step_cost = self._mobility
+
+                if step_cost != self._step_cost_by_coordinate.get(coordinate):
+                    self._step_cost_by_coordinate[coordinate] = step_cost
+                    changed_coordinates.add(coordinate)
+
+        blocked_coordinates = frozenset(
+            (x, y) for x, y in blocked_coordinates if x_min <= x <= x_max and y_min <= y <= y_max
+        )
+        changed_coordinates.update(blocked_coordinates ^ self._blocked_coordinates)
+        self._blocked_coordinates = blocked_coordinates
+
+        if self._revisions is None:
+            self._revisions = revisions
+            return self._search()
+
+        self._revisions = revisions
+
+        # The step cost of a tile is paid by its neighbors stepping onto it.
+        for coordinate in changed_coordinates:
+            self._update_lookahead_cost(coordinate)
+            for neighbor in self._neighbors_by_coordinate[coordinate]:
+                self._update_lookahead_cost(neighbor)
+
+        return self._settle()
+
+    def _search(self) -> int:
+        """
+        Compute the whole field from scratch, with reverse multi-source Dijkstra
+        seeded with every goal, and return the number of tiles settled.
+        """
+        blocked_coordinates = self._blocked_coordinates
+        cost_table = {goal: 0 for goal in self._goals if goal not in blocked_coordinates}
+        frontier = [(0, goal) for goal in cost_table]
+        heapq.heapify(frontier)
+
+        while frontier:
+            cost_so_far, current = heapq.heappop(frontier)
+
+            if cost_so_far > cost_table[current]:
+                continue
+
+            # Stepping from a neighbor onto current costs current's step cost.
+            new_cost = cost_so_far + self._step_cost_by_coordinate[current]
+
+            for neighbor in self._neighbors_by_coordinate[current]:
+                if neighbor not in blocked_coordinates and new_cost < cost_table.get(neighbor, inf):
+                    heapq.heappush(frontier, (new_cost, neighbor))
+                    cost_table[neighbor] = new_cost
+
+        self._cost_table = cost_table
+        self._lookahead_cost_table = dict(cost_table)
+        self._frontier = []
+        return len(cost_table)
+
+    def _settle(self) -> int:
+        """
+        Settle the tiles on the frontier, cheapest first, until every tile's cost
+        agrees with the cost implied by its neighbors. A repair reaching further
+        than a search from scratch would is cut short by one.
+        """
+        cost_table = self._cost_table
+        lookahead_cost_table = self._lookahead_cost_table
+        frontier = self._frontier
+        settled_limit = len(cost_table) * _REPAIR_SHARE_LIMIT
+        settled_count = 0
+
+        while frontier:
+            key, current = heapq.heappop(frontier)
+            cost = cost_table.get(current, inf)
+            lookahead_cost = lookahead_cost_table.get(current, inf)
+
+            if cost == lookahead_cost or key != min(cost, lookahead_cost):
+                continue
+
+            settled_count += 1
+            if settled_count > settled_limit:
+                return settled_count + self._search()
+
+            if cost > lookahead_cost:
+                cost_table[current] = lookahead_cost
+            else:
+                # The tile got more expensive, so it is reopened along with every
+                # neighbor that relied on it.
+                del cost_table[current]
+                self._update_lookahead_cost(current)
+
+            for neighbor in self._neighbors_by_coordinate[current]:
+                self._update_lookahead_cost(neighbor)
+
+        return settled_count
+
+    def _update_lookahead_cost(self, coordinate: tuple[int, int]) -> None:
+        cost_table = self._cost_table
+        lookahead_cost = inf
+
+        if coordinate in self._blocked_coordinates:
+            pass
+        elif coordinate in self._goals:
+            lookahead_cost = 0
+        else:
+            for neighbor in self._neighbors_by_coordinate[coordinate]:
+                if (cost := cost_table.get(neighbor)) is not None and neighbor not in self._blocked_coordinates:
+                    cost += self._step_cost_by_coordinate[neighbor]
+                    if cost < lookahead_cost:
+                        lookahead_cost = cost
+
+        if lookahead_cost == inf:
+            self._lookahead_cost_table.pop(coordinate, None)
+        else:
+            self._lookahead_cost_table[coordinate] = lookahead_cost
+
+        cost = cost_table.get(coordinate, inf)
+        if cost != lookahead_cost:
+            heapq.heappush(self._frontier, (min(cost, lookahead_cost), coordinate))
+
+
+@lru_cache(maxsize=None)
+def _get_neighbors_by_coordinate(boundaries: tuple[int, int, int, int]) -> dict[tuple[int, int], tuple[tuple[int, int], ...]]:
+    """
+    Return the neighbors within boundaries of every tile within boundaries.
+    """
+    x_min, x_max, y_min, y_max = boundaries
+
+    return {
+        (x, y): tuple(
+            (x + dx, y + dy)
+            for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1))
+            if x_min <= x + dx <= x_max and y_min <= y + dy <= y_max
+        )
+        for y in range(y_min, y_max + 1)
+        for x in range(x_min, x_max + 1)
+    }
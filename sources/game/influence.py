@@ -0,0 +1,54 @@
+from game.configurations import Color, Dimension
+from game.spatial import get_diamond_offsets
+from game.states import GameState
+
+
+class InfluenceMap:
+    """
+    How strongly each side bears on every tile of the board: the sum of the attack
+    of every soldier of a side that could move next to the tile and strike it, that
+    is, lying within its mobility plus its attack range, ignoring terrain. It is
+    built once per turn, spreading each side's attack with a diamond kernel over the
+    whole board at once, so the danger of a tile is then read without looking at
+    any unit.
+    """
+
+    def __init__(self) -> None:
+        self._planes = {
+            Color.BLUE: self._spread(GameState.soldiers["blue"]),
+            Color.RED: self._spread(GameState.soldiers["red"]),
+        }
+
+    def get_danger(self, color: str, coordinate: tuple[int, int]) -> float:
+        """
+        Return how much more the hostile side than the side of color bears on
+        coordinate.
+        """
+        x, y = coordinate
+        hostile_color = Color.RED if color == Color.BLUE else Color.BLUE
+        return self._planes[hostile_color][y][x] - self._planes[color][y][x]
+
+    @staticmethod
+    def _spread(soldiers: dict) -> list[list[float]]:
+        # Soldiers reaching equally far share a kernel.
+        units_by_radius: dict[int, list[tuple[tuple[int, int], float]]] = {}
+        for soldier in soldiers:
+            model = soldier.model
+            units_by_radius.setdefault(model.mobility + model.attack_range, []).append(((model.x, model.y), model.attack))
+
+        if grid := GameState.grid:
+            return grid.spread(units_by_radius).tolist()
+
+        # Tiles add up the kernel offsets in the same order as on the grid, so both
+        # give the very same floats.
+        width = Dimension.HORIZONTAL_FIELD_TILE_COUNT
+        height = Dimension.VERTICAL_TILE_COUNT
+        plane = [[0.0] * width for _ in range(height)]
+
+        for radius, units in units_by_radius.items():
+            for dx, dy in get_diamond_offsets(radius):
+                for (x, y), weight in units:
+                    if 0 <= x + dx < width and 0 <= y + dy < height:
+                        plane[y + dy][x + dx] += weight
+
+        return plane
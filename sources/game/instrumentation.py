@@ -0,0 +1,66 @@
+import os
+from collections import Counter
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+
+# Instrumentation is switched on for a whole run with TKTACTICS_INSTRUMENT=1. It is
+# decided once, at import, so that when it is off instrumented hands functions back
+# untouched and costs nothing per call.
+ENABLED = os.environ.get("TKTACTICS_INSTRUMENT") == "1"
+
+# Totals since the end of the last turn, by instrumented name
+call_count_by_name = Counter()
+duration_by_name = Counter()
+
+# Totals of the last turn, as summarized by end_turn
+last_turn = {}
+
+_node_count_at_turn_start = 0
+
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """
+    Count the calls of the decorated function and time them under name, when
+    instrumentation is enabled.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                call_count_by_name[name] += 1
+                duration_by_name[name] += perf_counter() - start
+
+        return wrapper
+
+    return decorate
+
+
+def end_turn(unit_count: int, node_count: int) -> None:
+    """
+    Summarize the totals since the end of the last turn into last_turn, for
+    unit_count units, and start counting the next turn. node_count is the number
+    of tiles the searches have settled so far.
+    """
+    global _node_count_at_turn_start
+
+    last_turn.clear()
+    last_turn.update(
+        {
+            "unit_count": unit_count,
+            "node_count": node_count - _node_count_at_turn_start,
+            "call_count_by_name": call_count_by_name.copy(),
+            "duration_by_name": duration_by_name.copy(),
+        }
+    )
+
+    _node_count_at_turn_start = node_count
+    call_count_by_name.clear()
+    duration_by_name.clear()
@@ -0,0 +1,63 @@
+import tkinter as tk
+from random import Random
+
+from game.configurations import Dimension
+from game.images import Image
+
+FIELD_NAMES = (*(f"grass_{i}" for i in range(1, 16)), "rock", "tree")
+FIELD_WEIGHTS = (56, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 15, 15)
+OBSTACLE_NAMES = frozenset({"rock", "tree"})
+
+
+def generate_field_names(rng: Random) -> dict[tuple[int, int], str]:
+    """
+    Randomly pick the image name of every field tile with rng.
+    """
+    names = {}
+
+    for y in range(Dimension.VERTICAL_TILE_COUNT):
+        for x in range(Dimension.HORIZONTAL_FIELD_TILE_COUNT):
+            [names[(x, y)]] = rng.choices(FIELD_NAMES, weights=FIELD_WEIGHTS)
+
+    return names
+
+
+def get_field_cost(name: str) -> int:
+    """
+    Return the movement cost of a field tile, where -1 costs a unit's full mobility.
+    """
+    return -1 if name in OBSTACLE_NAMES else 1
+
+
+class LandscapeImage:
+    """
+    Draw every field tile into one off-screen image shown as a single canvas item,
+    so that Tk hit-tests and redraws one item for the whole terrain rather than
+    one per tile. A tile is redrawn by patching its pixels into the image.
+    """
+
+    def __init__(self, canvas: tk.Canvas) -> None:
+        self._image = tk.PhotoImage(
+            width=Dimension.TILE_DIMENSION * Dimension.HORIZONTAL_FIELD_TILE_COUNT,
+            height=Dimension.TILE_DIMENSION * Dimension.VERTICAL_TILE_COUNT,
+        )
+        self.id = canvas.create_image(0, 0, anchor=tk.NW, image=self._image)
+        canvas.tag_lower(self.id)
+
+    def draw(self, name_by_coordinate: dict[tuple[int, int], str]) -> None:
+        for coordinate, name in name_by_coordinate.items():
+            self.patch(coordinate, name)
+
+    def patch(self, coordinate: tuple[int, int], name: str) -> None:
+        x, y = coordinate
+        # Replace rather than blend, so that a tile leaves nothing of the one it covers.
+        self._image.tk.call(
+            self._image,
+            "copy",
+            getattr(Image, name),
+            "-to",
+            Dimension.TILE_DIMENSION * x,
+            Dimension.TILE_DIMENSION * y,
+            "-compositingrule",
+            "set",
+        )
@@ -0,0 +1,368 @@
+from copy import copy
+from math import inf
+from time import perf_counter
+from typing import NamedTuple
+
+from game.base import GameObject, GameObjectModel
+from game.configurations import Color
+from game.instrumentation import instrumented
+from game.soldiers.base import HuntAction, Soldier
+from game.states import GameState
+
+# How much a search line gains by killing a unit, and by killing a critical
+# building, on top of the damage dealt, in health points
+_KILL_BONUS = 50.0
+_CRITICAL_KILL_BONUS = 200.0
+
+# How much a search line loses per point of danger on the tiles it moves onto
+_DANGER_WEIGHT = 0.1
+
+# Stands for a key a state's own layer does not hold, in its undo log
+_ABSENT = object()
+
+
+class SearchAction(NamedTuple):
+    """
+    The move of the unit of unit_id to destination, then its attack on the unit of
+    target_id, if any.
+    """
+
+    unit_id: int
+    destination: tuple[int, int]
+    target_id: int | None
+
+
+class SearchState:
+    """
+    A view-free board for searching ahead: the model of every unit by id, and the
+    id of the unit on every coordinate. A fork holds only what changed since the
+    state it was forked from, and looks everything else up there, so forking costs
+    nothing and changing a unit costs a copy of its model. Actions applied to a
+    state can be undone, last first.
+    """
+
+    def __init__(self, units: list[GameObject], parent: "SearchState | None" = None) -> None:
+        self.units = units
+        self._parent = parent
+
+        # None stands for a unit killed, or a coordinate vacated, in this layer.
+        self._model_by_id: dict[int, GameObjectModel | None] = {}
+        self._id_by_coordinate: dict[tuple[int, int], int | None] = {}
+        self._undo_log: list[list[tuple[dict, object, object]]] = []
+
+    @classmethod
+    def from_game(cls) -> "SearchState":
+        """
+        Return a state holding the units currently on the board. Their models are
+        shared with the game until the state changes them.
+        """
+        units = [*GameState.blue_unit_by_coordinate.values(), *GameState.red_unit_by_coordinate.values()]
+        state = cls(units)
+
+        for unit_id, unit in enumerate(units):
+            state._model_by_id[unit_id] = unit.model
+            state._id_by_coordinate[(unit.model.x, unit.model.y)] = unit_id
+
+        return state
+
+    def fork(self) -> "SearchState":
+        return SearchState(self.units, self)
+
+    # GET
+    def get_model(self, unit_id: int) -> GameObjectModel | None:
+        """
+        Return the model of the unit of unit_id, or None once it is killed.
+        """
+        state = self
+        while state:
+            if unit_id in state._model_by_id:
+                return state._model_by_id[unit_id]
+            state = state._parent
+
+        return None
+
+    def get_id_at(self, coordinate: tuple[int, int]) -> int | None:
+        state = self
+        while state:
+            if coordinate in state._id_by_coordinate:
+                return state._id_by_coordinate[coordinate]
+            state = state._parent
+
+        return None
+
+    # SET
+    def apply(self, action: SearchAction) -> None:
+        changes = []
+        model = copy(self.get_model(action.unit_id))
+
+        if action.destination != (model.x, model.y):
+            self._set(self._id_by_coordinate, (model.x, model.y), None, changes)
+            self._set(self._id_by_coordinate, action.destination, action.unit_id, changes)
+            model.move_to(*action.destination)
+
+        if action.target_id is not None:
+            target = copy(self.get_model(action.target_id))
+            model.assault(target)
+
+            if target.health:
+                self._set(self._model_by_id, action.target_id, target, changes)
+            else:
+                self._set(self._model_by_id, action.target_id, None, changes)
+                self._set(self._id_by_coordinate, (target.x, target.y), None, changes)
+
+        self._set(self._model_by_id, action.unit_id, model, changes)
+        self._undo_log.append(changes)
+
+    def undo(self) -> None:
+        """
+        Undo the last action applied to self.
+        """
+        for table, key, value in reversed(self._undo_log.pop()):
+            if value is _ABSENT:
+                del table[key]
+            else:
+                table[key] = value
+
+    @staticmethod
+    def _set(table: dict, key: object, value: object, changes: list[tuple[dict, object, object]]) -> None:
+        changes.append((table, key, table.get(key, _ABSENT)))
+        table[key] = value
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class TurnSearch:
+    """
+    Plan the red soldiers' turn by searching ahead over the actions of the next
+    few soldiers to act, rather than greedily one soldier at a time, so that they
+    can share out targets, finish off wounded units and save blows. Each soldier
+    weighs the action hunting would pick plus its best attacks, and the line of
+    actions dealing the most damage and kills, at the least danger, wins, whichever
+    of those soldiers it starts with.
+
+    The search is anytime: every decision starts from the greedy action, then
+    searches lines one action longer at a time, trying the best first action found
+    so far first, and takes the best first action of the longest line searched in
+    full once its share of the turn's budget runs out.
+
+    How many lines were searched in full for each decision is kept in depths, and
+    a search given the depths of a logged turn searches exactly as deep, with no
+    deadline, so that the turn replays as it was played.
+    """
+
+    def __init__(self, budget: float, depth: int = 3, width: int = 4, depths: list[int] | None = None) -> None:
+        self._deadline = inf if depths is not None else perf_counter() + budget
+        self._depth = depth
+        self._width = width
+        self._replayed_depths = iter(depths) if depths is not None else None
+        self.depths: list[int] = []
+        self.position_count = 0
+
+        # The decision being searched
+        self._decision_deadline = 0.0
+        self._unit_ids: list[int] = []
+        self._candidates_by_id: dict[int, list[SearchAction]] = {}
+
+    @instrumented("lookahead")
+    def plan_hunt(self, soldiers: list[Soldier]) -> HuntAction:
+        """
+        Decide the next action among soldiers, those yet to act this turn in turn
+        order, without changing anything. The action may be that of any of the
+        first few of them.
+        """
+        greedy_action = soldiers[0].plan_hunt()
+        self.depths.append(0)
+
+        # Turns logged before the search existed were planned greedily, and log no
+        # depths.
+        max_depth = self._depth if self._replayed_depths is None else next(self._replayed_depths, 0)
+
+        now = perf_counter()
+        if len(soldiers) == 1 or self._depth == 1 or max_depth == 0 or now >= self._deadline:
+            return greedy_action
+
+        # Each soldier left gets an even share of the time left.
+        self._decision_deadline = now + (self._deadline - now) / len(soldiers)
+        state = SearchState.from_game()
+        self._unit_ids.clear()
+        self._candidates_by_id.clear()
+        greedy_action_by_id = {}
+
+        for i, soldier in enumerate(soldiers[:self._depth]):
+            unit_id = state.get_id_at((soldier.model.x, soldier.model.y))
+            greedy_action_by_id[unit_id] = greedy_action if i == 0 else soldier.plan_hunt()
+            self._candidates_by_id[unit_id] = self._get_candidates(state, unit_id, greedy_action_by_id[unit_id])
+            self._unit_ids.append(unit_id)
+
+            if perf_counter() >= self._decision_deadline:
+                return greedy_action
+
+        best_action = self._to_search_action(state, greedy_action)
+
+        for depth in range(1, min(len(self._unit_ids), max_depth) + 1):
+            try:
+                best_action = self._search_first_action(state, depth, best_action)
+            except _SearchTimeout:
+                break
+            self.depths[-1] = depth
+
+        greedy_action = greedy_action_by_id[best_action.unit_id]
+        if best_action == self._to_search_action(state, greedy_action):
+            return greedy_action
+
+        return self._to_hunt_action(state, best_action)
+
+    def _search_first_action(self, state: SearchState, depth: int, first_action: SearchAction) -> SearchAction:
+        """
+        Return the first action of the line of depth actions gaining the most from
+        state, trying first_action first, which also wins ties.
+        """
+        actions = [
+            action
+            for unit_id in self._unit_ids
+            for action in self._get_valid_candidates(state, unit_id)
+        ]
+        actions.remove(first_action)
+        actions.insert(0, first_action)
+
+        best_value = -inf
+        best_action = first_action
+
+        for action in actions:
+            # Each first action is searched on a fork of its own, so that running out
+            # of time midway leaves nothing to undo.
+            fork = state.fork()
+            value = self._apply(fork, action) + self._search(fork, depth - 1, {action.unit_id})
+
+            if value > best_value:
+                best_value = value
+                best_action = action
+
+        return best_action
+
+    def _search(self, state: SearchState, depth: int, acted_unit_ids: set[int]) -> float:
+        """
+        Return the most a line of depth actions of the soldiers yet to act can gain
+        from state.
+        """
+        if depth == 0 or len(acted_unit_ids) == len(self._unit_ids):
+            return 0.0
+
+        best_value = -inf
+        for unit_id in self._unit_ids:
+            if unit_id in acted_unit_ids:
+                continue
+
+            acted_unit_ids.add(unit_id)
+            for action in self._get_valid_candidates(state, unit_id):
+                value = self._apply(state, action) + self._search(state, depth - 1, acted_unit_ids)
+                state.undo()
+                best_value = max(best_value, value)
+            acted_unit_ids.remove(unit_id)
+
+        return best_value
+
+    def _apply(self, state: SearchState, action: SearchAction) -> float:
+        """
+        Apply action to state and return what it gains.
+        """
+        if perf_counter() >= self._decision_deadline:
+            raise _SearchTimeout
+
+        self.position_count += 1
+        gain = -_DANGER_WEIGHT * self._get_danger(action.destination)
+
+        if action.target_id is not None:
+            target = state.get_model(action.target_id)
+            damage = state.get_model(action.unit_id).get_damage_output_against(target)
+            gain += damage
+
+            if damage >= target.health:
+                gain += _KILL_BONUS
+                if state.units[action.target_id] in GameState.buildings["critical"]:
+                    gain += _CRITICAL_KILL_BONUS
+
+        state.apply(action)
+        return gain
+
+    def _get_candidates(self, state: SearchState, unit_id: int, greedy_action: HuntAction) -> list[SearchAction]:
+        """
+        Return the actions worth weighing for the soldier of unit_id, the greedy one
+        first, then its best attacks on every hostile unit within reach. Each attack
+        is made from the least dangerous tile reaching the target.
+        """
+        model = state.get_model(unit_id)
+        start = (model.x, model.y)
+        reachable_coordinates = sorted(
+            (*model.get_reachable_coordinates(), start),
+            key=lambda c: (self._get_danger(c), model.get_distance_to(c), c[1], c[0]),
+        )
+        attacks = []
+
+        for coordinate in GameState.unit_index.get_units_in_range(
+            start,
+            model.mobility + model.attack_range,
+            Color.RED if model.color == Color.BLUE else Color.BLUE,
+        ):
+            target_id = state.get_id_at(coordinate)
+            target = state.get_model(target_id)
+
+            for destination in reachable_coordinates:
+                if target.get_distance_to(destination) <= model.attack_range:
+                    damage = model.get_damage_output_against(target)
+                    attacks.append(((damage < target.health, -damage), SearchAction(unit_id, destination, target_id)))
+                    break
+
+        attacks.sort(key=lambda attack: attack[0])
+        return [self._to_search_action(state, greedy_action), *(action for _, action in attacks)]
+
+    def _get_valid_candidates(self, state: SearchState, unit_id: int) -> list[SearchAction]:
+        """
+        Return the candidates of the soldier of unit_id still possible in state, at
+        most width of them. Their destination must still be free, and their target
+        alive, or the attack is dropped from the action.
+        """
+        candidates = []
+
+        for action in self._candidates_by_id[unit_id]:
+            if state.get_id_at(action.destination) not in (None, unit_id):
+                continue
+
+            if action.target_id is not None and state.get_model(action.target_id) is None:
+                action = action._replace(target_id=None)
+
+            if action not in candidates:
+                candidates.append(action)
+                if len(candidates) == self._width:
+                    break
+
+        if not candidates:
+            model = state.get_model(unit_id)
+            candidates.append(SearchAction(unit_id, (model.x, model.y), None))
+
+        return candidates
+
+    @staticmethod
+    def _get_danger(coordinate: tuple[int, int]) -> float:
+        if influence_map := GameState.influence_map:
+            return influence_map.get_danger(Color.RED, coordinate)
+        return 0.0
+
+    @staticmethod
+    def _to_search_action(state: SearchState, action: HuntAction) -> SearchAction:
+        target = action.target.model
+        return SearchAction(
+            state.get_id_at((action.soldier.model.x, action.soldier.model.y)),
+            action.path[-1],
+            state.get_id_at((target.x, target.y)) if action.damage else None,
+        )
+
+    @staticmethod
+    def _to_hunt_action(state: SearchState, action: SearchAction) -> HuntAction:
+        # Only the greedy action can leave out an attack on the state searched from.
+        soldier = state.units[action.unit_id]
+        target = state.units[action.target_id]
+        damage = soldier.model.get_damage_output_against(target.model)
+        return HuntAction(soldier, soldier.model.get_path_to(action.destination), target, damage, damage >= target.model.health)
@@ -0,0 +1,307 @@
+import heapq
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache
+from math import inf
+
+from game.clusters import ClusterGraph
+from game.configurations import Color
+from game.incremental import IncrementalField
+from game.instrumentation import instrumented
+from game.states import GameState
+
+# Every search below is cached against the revisions of the board layers it reads
+# (see GameState.revisions), so a result is reused until one of them changes.
+
+# How many times each search actually ran, and how many tiles it settled in total
+call_count_by_search = Counter()
+node_count_by_search = Counter()
+
+# Below this mobility, a reachability search settles too few tiles for the NumPy
+# grid's per-call overhead to pay off, as measured with benchmark.py.
+_GRID_REACHABILITY_MINIMUM_MOBILITY = 8
+
+# From this many tiles within boundaries on, distance fields are found through a
+# ClusterGraph, which only searches the clusters they are looked up in, rather
+# than over the whole board. The NumPy grid sweeps whole boards fast enough to keep
+# up until they are much larger, as measured with benchmark.py.
+_CLUSTER_GRAPH_MINIMUM_TILE_COUNT = 32 * 32
+_GRID_CLUSTER_GRAPH_MINIMUM_TILE_COUNT = 160 * 160
+
+# Cluster graphs by mobility, boundaries and color, each kept up to date with the
+# board as it is used
+_cluster_graph_by_key = {}
+
+# Distance fields repaired in place as the board changes, by target, attack range,
+# mobility, boundaries and color, least recently used first
+_incremental_field_by_key = OrderedDict()
+_INCREMENTAL_FIELD_CAPACITY = 256
+
+
+def reset() -> None:
+    """
+    Forget the cluster graphs and repaired distance fields, which are otherwise
+    kept across revisions.
+    """
+    _cluster_graph_by_key.clear()
+    _incremental_field_by_key.clear()
+
+
+@instrumented("reachable_coordinates")
+def get_reachable_coordinates(
+    start: tuple[int, int],
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+) -> frozenset[tuple[int, int]]:
+    """
+    Return every coordinate a unit of color standing on start can move to this turn.
+    """
+    return _get_reachable_coordinates(start, mobility, boundaries, color, *_get_revisions(color))
+
+
+@instrumented("approaching_path")
+def get_approaching_path(
+    start: tuple[int, int],
+    mobility: int,
+    attack_range: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    target: tuple[int, int],
+) -> tuple[tuple[int, int]]:
+    """
+    Look up the distance field toward target, which holds the cheapest cost for a
+    unit of color to move from every tile until target is within its attack range.
+    Return the path to the coordinate the unit can reach this turn that is the
+    closest to target according to the field.
+    """
+    return _get_approaching_path(start, mobility, attack_range, boundaries, color, target, *_get_revisions(color))
+
+
+def get_distance_field(
+    target: tuple[int, int],
+    attack_range: int,
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+) -> Mapping[tuple[int, int], int]:
+    """
+    Return the cheapest cost for a unit of color to move from every tile to the
+    nearest tile from which target is within attack_range. The field is computed
+    once and shared by every unit of color with the same attack range, mobility and
+    boundaries, as long as neither the terrain nor any hostile unit changes.
+    Without NumPy, the field of a target is kept instead, and repaired where the
+    board changed rather than computed again. On large boards, the field follows a
+    ClusterGraph of the board, and is only computed around the tiles it is looked
+    up for.
+    """
+    cost_revision, _, hostile_revision = _get_revisions(color)
+
+    return _get_distance_field(target, attack_range, mobility, boundaries, color, cost_revision, hostile_revision)
+
+
+def get_movement_tables(
+    start: tuple[int, int],
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+) -> tuple[dict[tuple[int, int], int], dict[tuple[int, int], tuple[int, int] | None]]:
+    """
+    Use Dijkstra to compute the cheapest cost of, and the preceding coordinate on
+    the cheapest path to, every coordinate a unit of color standing on start can
+    step on this turn. The returned tables are shared and must not be modified.
+    """
+    cost_revision, _, hostile_revision = _get_revisions(color)
+    return _get_movement_tables(start, mobility, boundaries, color, cost_revision, hostile_revision)
+
+
+def _get_revisions(color: str) -> tuple[int, int, int]:
+    hostile_color = Color.RED if color == Color.BLUE else Color.BLUE
+    return GameState.revisions["cost"], GameState.revisions[color], GameState.revisions[hostile_color]
+
+
+def _get_unit_by_coordinate(color: str) -> dict[tuple[int, int], object]:
+    if color == Color.BLUE:
+        return GameState.blue_unit_by_coordinate
+    else:
+        return GameState.red_unit_by_coordinate
+
+
+def _get_hostile_unit_by_coordinate(color: str) -> dict[tuple[int, int], object]:
+    return _get_unit_by_coordinate(Color.RED if color == Color.BLUE else Color.BLUE)
+
+
+@lru_cache(maxsize=1024)
+def _get_reachable_coordinates(
+    start: tuple[int, int],
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    cost_revision: int,
+    friendly_revision: int,
+    hostile_revision: int,
+) -> frozenset[tuple[int, int]]:
+    if (grid := GameState.grid) and mobility >= _GRID_REACHABILITY_MINIMUM_MOBILITY:
+        reachables = frozenset(grid.get_reachable_coordinates(start, mobility, boundaries, color))
+    else:
+        cost_table, _ = get_movement_tables(start, mobility, boundaries, color)
+        friendly_coordinates = _get_unit_by_coordinate(color)
+        reachables = frozenset(coordinate for coordinate in cost_table if coordinate not in friendly_coordinates)
+
+    call_count_by_search["reachable_coordinates"] += 1
+    node_count_by_search["reachable_coordinates"] += len(reachables)
+    return reachables
+
+
+@lru_cache(maxsize=4096)
+def _get_approaching_path(
+    start: tuple[int, int],
+    mobility: int,
+    attack_range: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    target: tuple[int, int],
+    cost_revision: int,
+    friendly_revision: int,
+    hostile_revision: int,
+) -> tuple[tuple[int, int]]:
+    field = get_distance_field(target, attack_range, mobility, boundaries, color)
+    cost_table, parent_table = get_movement_tables(start, mobility, boundaries, color)
+    friendly_coordinates = _get_unit_by_coordinate(color)
+
+    optimal_end = start
+
+    for coordinate, cost in cost_table.items():
+        if (
+            coordinate in field
+            and coordinate not in friendly_coordinates
+            and (field[coordinate], cost) < (field.get(optimal_end, inf), cost_table[optimal_end])
+        ):
+            optimal_end = coordinate
+
+    optimal_path_this_turn = []
+    c = optimal_end
+    while c:
+        optimal_path_this_turn.append(c)
+        c = parent_table[c]
+    optimal_path_this_turn.reverse()
+
+    call_count_by_search["approaching_path"] += 1
+    node_count_by_search["approaching_path"] += len(cost_table)
+
+    # TODO: When target is surrounded by obstacles, the unit should try to approach it.
+    return tuple(optimal_path_this_turn)
+
+
+@lru_cache(maxsize=256)
+def _get_distance_field(
+    target: tuple[int, int],
+    attack_range: int,
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    cost_revision: int,
+    hostile_revision: int,
+) -> Mapping[tuple[int, int], int]:
+    call_count_by_search["distance_field"] += 1
+
+    x_min, x_max, y_min, y_max = boundaries
+    grid = GameState.grid
+
+    if (x_max - x_min + 1) * (y_max - y_min + 1) >= (
+        _GRID_CLUSTER_GRAPH_MINIMUM_TILE_COUNT if grid else _CLUSTER_GRAPH_MINIMUM_TILE_COUNT
+    ):
+        graph = _get_cluster_graph(mobility, boundaries, color, cost_revision, hostile_revision)
+        return graph.get_distance_field(target, attack_range)
+
+    if grid:
+        field = grid.get_distance_field(target, attack_range, mobility, boundaries, color)
+        node_count_by_search["distance_field"] += len(field)
+        return field
+
+    return _get_incremental_field(target, attack_range, mobility, boundaries, color, cost_revision, hostile_revision)
+
+
+def _get_incremental_field(
+    target: tuple[int, int],
+    attack_range: int,
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    cost_revision: int,
+    hostile_revision: int,
+) -> IncrementalField:
+    key = (target, attack_range, mobility, boundaries, color)
+
+    if (field := _incremental_field_by_key.get(key)) is None:
+        field = _incremental_field_by_key[key] = IncrementalField(target, attack_range, mobility, boundaries)
+        if len(_incremental_field_by_key) > _INCREMENTAL_FIELD_CAPACITY:
+            _incremental_field_by_key.popitem(last=False)
+    else:
+        _incremental_field_by_key.move_to_end(key)
+
+    settled_count = field.update(_get_hostile_unit_by_coordinate(color), (cost_revision, hostile_revision))
+    node_count_by_search["distance_field"] += settled_count
+
+    return field
+
+
+def _get_cluster_graph(
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    cost_revision: int,
+    hostile_revision: int,
+) -> ClusterGraph:
+    key = (mobility, boundaries, color)
+    if (graph := _cluster_graph_by_key.get(key)) is None:
+        graph = _cluster_graph_by_key[key] = ClusterGraph(mobility, boundaries, node_count_by_search)
+
+    graph.update(_get_hostile_unit_by_coordinate(color), (cost_revision, hostile_revision))
+    return graph
+
+
+@lru_cache(maxsize=1024)
+def _get_movement_tables(
+    start: tuple[int, int],
+    mobility: int,
+    boundaries: tuple[int, int, int, int],
+    color: str,
+    cost_revision: int,
+    hostile_revision: int,
+) -> tuple[dict[tuple[int, int], int], dict[tuple[int, int], tuple[int, int] | None]]:
+    x_min, x_max, y_min, y_max = boundaries
+    blocked_coordinates = _get_hostile_unit_by_coordinate(color)
+
+    frontier = [(0, start)]
+    cost_table = {start: 0}
+    parent_table = {start: None}
+
+    while frontier:
+        cost_so_far, current = heapq.heappop(frontier)
+
+        if cost_so_far >= mobility or cost_so_far > cost_table[current]:
+            continue
+
+        for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)):
+            neighbor = x, y = current[0] + dx, current[1] + dy
+
+            if (
+                x_min <= x <= x_max
+                and y_min <= y <= y_max
+                and neighbor not in blocked_coordinates
+            ):
+                step_cost = GameState.cost_by_coordinate[neighbor]
+                if step_cost == -1:
+                    step_cost = mobility
+
+                new_cost = cost_so_far + step_cost
+
+                if new_cost <= mobility and (neighbor not in cost_table or new_cost < cost_table[neighbor]):
+                    heapq.heappush(frontier, (new_cost, neighbor))
+                    cost_table[neighbor] = new_cost
+                    parent_table[neighbor] = current
+
+    call_count_by_search["movement_tables"] += 1
+    node_count_by_search["movement_tables"] += len(cost_table)
+    return cost_table, parent_table
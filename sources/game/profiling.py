@@ -0,0 +1,32 @@
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class StartupProfile:
+    """
+    Time the phases of a program's startup, from its creation to its first frame,
+    and report them to stderr. Phases are reported in the order they ran, with the
+    time outside any phase reported as "other".
+    """
+
+    def __init__(self) -> None:
+        self._start = perf_counter()
+        self._duration_by_phase: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._duration_by_phase[name] = self._duration_by_phase.get(name, 0.0) + perf_counter() - start
+
+    def report(self) -> None:
+        total = perf_counter() - self._start
+        other = total - sum(self._duration_by_phase.values())
+
+        for name, duration in (*self._duration_by_phase.items(), ("other", other)):
+            print(f"{name:<24}{duration * 1000:>10.1f} ms", file=sys.stderr)
+        print(f"{"first frame":<24}{total * 1000:>10.1f} ms", file=sys.stderr)
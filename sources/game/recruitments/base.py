@@ -25,12 +25,13 @@ class SoldierRecruitmentView(GameObjectView):
             command = event_handlers["click"]
         else:
             color = Color.GRAY
-            command = lambda: None
+            command = ""
 
         color_name = Color.COLOR_NAME_BY_HEX_TRIPLET[color]
         soldier_name = data["recruit_name"]
 
-        self._widgets["main"].configure(
+        self._configure_widget(
+            "main",
             command=command,
             cursor="hand2",
             image=getattr(Image, f"{color_name}_{soldier_name}"),
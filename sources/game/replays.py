@@ -0,0 +1,51 @@
+from time import perf_counter
+
+from game import soldiers
+from game.simulation import Simulation
+from game.states import GameState
+
+
+class Replay(Simulation):
+    """
+    Re-execute the commands of a logged game on plain models with null views, as
+    fast as the game logic allows. The board is rebuilt from the logged seed, so
+    the landscape and the waves come out as they did in the game.
+    """
+
+    def __init__(self, seed: int, commands: list[list[str]], use_numpy: bool = True) -> None:
+        super().__init__(use_numpy=use_numpy, seed=seed)
+        self._commands = commands
+        self.turn_durations: list[float] = []
+
+    def run(self) -> str | None:
+        """
+        Execute every command, timing each end of turn, and return the outcome.
+        """
+        for i, command in enumerate(self._commands):
+            match command:
+                case ["move", x, y, target_x, target_y]:
+                    soldier = GameState.blue_unit_by_coordinate[(int(x), int(y))]
+                    soldier.move_to(int(target_x), int(target_y))
+                case ["assault", x, y, target_x, target_y]:
+                    soldier = GameState.blue_unit_by_coordinate[(int(x), int(y))]
+                    soldier.assault(GameState.red_unit_by_coordinate[(int(target_x), int(target_y))])
+                case ["recruit", name, x, y]:
+                    getattr(soldiers, name.capitalize()).recruit(int(x), int(y), {})
+                case ["end"]:
+                    # The computer plans its turn as deep as the search logged right
+                    # after it, or greedily if the game was logged before the search.
+                    match self._commands[i + 1:i + 2]:
+                        case [["search", *depths]]:
+                            search_depths = [int(depth) for depth in depths]
+                        case _:
+                            search_depths = []
+
+                    start = perf_counter()
+                    self.end_turn(search_depths)
+                    self.turn_durations.append(perf_counter() - start)
+                case ["search", *_]:
+                    pass
+                case _:
+                    raise ValueError(f"Unknown command: {" ".join(command)}")
+
+        return self.outcome
@@ -0,0 +1,119 @@
+from game.buildings import Barrack
+from game.configurations import Color, Dimension
+from game.controls import EndTurnControl
+from game.displays import CoinDisplay, DayDisplay
+from game.grids import Grid
+from game.influence import InfluenceMap
+from game.landscapes import generate_field_names, get_field_cost
+from game.snapshots import Snapshot
+from game.soldiers import Archer, Cavalry, Hero, Infantry
+from game.states import Environment, GameState
+
+
+class Simulation:
+    """
+    Play a game on plain models with null views, so that turns advance as fast as
+    the game logic allows. The blue army is driven by the same hunting logic as
+    the red one. The game starts from a snapshot file if one is given.
+    """
+
+    def __init__(self, use_numpy: bool = True, seed: int | None = None, snapshot: str | None = None) -> None:
+        Environment.headless = True
+        GameState.reset()
+        GameState.seed_rng(seed)
+
+        self._create_displays()
+        self._create_controls()
+        if snapshot:
+            Snapshot(snapshot).load({})
+        else:
+            self._create_landscape()
+            self._create_initial_buildings()
+            self._create_initial_blue_soldiers()
+        if use_numpy:
+            GameState.grid = Grid.create()
+
+        self.turn_count = 0
+
+    @property
+    def outcome(self) -> str | None:
+        if control := GameState.controls["display_outcome"]:
+            return control.model.text
+
+        return None
+
+    def run(self, max_turn_count: int) -> str | None:
+        """
+        Play turns until the game is decided or max_turn_count turns have been played.
+        """
+        while self.outcome is None and self.turn_count < max_turn_count:
+            self.execute_blue_turn()
+            self.end_turn()
+
+        return self.outcome
+
+    def execute_blue_turn(self) -> None:
+        self._recruit_blue_soldiers()
+        GameState.influence_map = InfluenceMap()
+
+        for soldier in list(GameState.soldiers["blue"]):
+            if not GameState.red_unit_by_coordinate:
+                break
+
+            # Recruits only become active on the next turn.
+            if not soldier.model.moved_this_turn:
+                soldier.hunt()
+
+    def end_turn(self, search_depths: list[int] | None = None) -> None:
+        GameState.controls["end_turn"].handle_click_event(search_depths)
+        self.turn_count += 1
+
+    def _recruit_blue_soldiers(self) -> None:
+        coin_display = GameState.displays["coin"]
+        targets = (Infantry, Archer, Cavalry)
+
+        for barrack in list(GameState.buildings["critical"]):
+            for dx, dy in ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)):
+                x, y = barrack.model.x + dx, barrack.model.y + dy
+                target = targets[(GameState.wave + x + y) % len(targets)]
+
+                if (
+                    coin_display.model.coin >= target.get_model_class().cost
+                    and 0 < x < Dimension.HORIZONTAL_FIELD_TILE_COUNT - 1
+                    and 0 < y < Dimension.VERTICAL_TILE_COUNT - 1
+                    and (x, y) not in GameState.blue_unit_by_coordinate
+                    and (x, y) not in GameState.red_unit_by_coordinate
+                ):
+                    target.recruit(x, y, {})
+
+    def _create_displays(self) -> None:
+        DayDisplay.create({"x": 0, "y": 0}, {})
+        CoinDisplay.create({"x": 0, "y": 0}, {})
+
+    def _create_controls(self) -> None:
+        EndTurnControl.create({"x": 0, "y": 0}, {})
+
+    def _create_landscape(self) -> None:
+        for coordinate, name in generate_field_names(GameState.rng).items():
+            GameState.field_name_by_coordinate[coordinate] = name
+            GameState.cost_by_coordinate[coordinate] = get_field_cost(name)
+
+        GameState.revisions["cost"] += 1
+
+    def _create_initial_buildings(self) -> None:
+        x = Dimension.HORIZONTAL_FIELD_TILE_COUNT // 2
+        y = Dimension.VERTICAL_TILE_COUNT // 2
+
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                GameState.field_name_by_coordinate[(x + dx, y + dy)] = "grass_1"
+                GameState.cost_by_coordinate[(x + dx, y + dy)] = 1
+
+        GameState.revisions["cost"] += 1
+
+        Barrack.create({"x": x, "y": y}, {})
+
+    def _create_initial_blue_soldiers(self) -> None:
+        x = Dimension.HORIZONTAL_FIELD_TILE_COUNT // 2
+        y = Dimension.VERTICAL_TILE_COUNT // 2 + 1
+        Hero.create({"x": x, "y": y, "color": Color.BLUE}, {})
@@ -0,0 +1,181 @@
+import io
+import os
+import pickle
+from array import array
+
+from game import buildings, soldiers
+from game.configurations import Dimension
+from game.landscapes import FIELD_NAMES
+from game.states import GameState
+
+MAGIC = b"TKTS"
+VERSION = 1
+
+# The model fields of a soldier that change during a game
+SOLDIER_FIELDS = (
+    "level",
+    "experience",
+    "attack",
+    "defense",
+    "health",
+    "max_health",
+    "moved_this_turn",
+    "attacked_this_turn",
+)
+
+_UNKNOWN_FIELD_NAME = 255
+
+
+class Snapshot:
+    """
+    Save the state of a game to a compact binary file at path, and restore it.
+    The board is packed into byte arrays of one byte per tile, and everything else
+    into plain tuples, pickled without any class so loading a file cannot run
+    code. The board, by far the largest part on big maps, is only packed again
+    when the terrain has changed, and a file is only written again when its
+    content has changed, so autosaving after every turn stays cheap.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._board_revision = None
+        self._board = None
+        self._blob = None
+
+    def save(self) -> None:
+        blob = MAGIC + bytes([VERSION]) + pickle.dumps(self._encode(), protocol=pickle.HIGHEST_PROTOCOL)
+        if blob == self._blob:
+            return
+
+        # Write aside then swap, so a crash never leaves a truncated snapshot.
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(blob)
+        os.replace(temporary_path, self.path)
+
+        self._blob = blob
+
+    def load(self, view_config: dict) -> None:
+        """
+        Restore the saved game onto a board holding only its displays and controls.
+        Every model is rebuilt before any view is attached.
+        """
+        with open(self.path, "rb") as file:
+            blob = file.read()
+
+        if blob[:len(MAGIC)] != MAGIC or blob[len(MAGIC)] != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} snapshot.")
+
+        state = _RestrictedUnpickler(io.BytesIO(blob[len(MAGIC) + 1:])).load()
+
+        width = Dimension.HORIZONTAL_FIELD_TILE_COUNT
+        if (state["width"], state["height"]) != (width, Dimension.VERTICAL_TILE_COUNT):
+            raise ValueError(f"{self.path} holds a {state["width"]}x{state["height"]} board.")
+
+        GameState.seed = state["seed"]
+        GameState.rng.setstate(state["rng"])
+        GameState.wave = state["wave"]
+
+        GameState.displays["day"].model.day = state["day"]
+        GameState.displays["day"].refresh()
+        GameState.displays["coin"].model.coin = state["coin"]
+        GameState.displays["coin"].refresh()
+
+        control = GameState.controls["end_turn"]
+        control.model.day_phase, control.model.first_wave_names, control.model.victorious = state["end_turn"]
+
+        # Board
+        costs = array("b")
+        costs.frombytes(state["costs"])
+
+        for i, (cost, name_index) in enumerate(zip(costs, state["field_names"])):
+            coordinate = (i % width, i // width)
+            GameState.cost_by_coordinate[coordinate] = cost
+            if name_index != _UNKNOWN_FIELD_NAME:
+                GameState.field_name_by_coordinate[coordinate] = FIELD_NAMES[name_index]
+
+        GameState.revisions["cost"] += 1
+
+        # Units
+        view_config = {**view_config, "attach": False}
+        units = []
+
+        for name, x, y, health in state["buildings"]:
+            building = getattr(buildings, name).create({"x": x, "y": y}, view_config)
+            building.model.health = health
+            units.append(building)
+
+        for name, x, y, color, *values in state["soldiers"]:
+            soldier = getattr(soldiers, name).create({"x": x, "y": y, "color": color}, view_config)
+            for field, value in zip(SOLDIER_FIELDS, values):
+                setattr(soldier.model, field, value)
+            units.append(soldier)
+
+        # Units are looked up in the order they were placed, which breaks ties when hunting.
+        for unit_by_coordinate, order in (
+            (GameState.blue_unit_by_coordinate, state["blue_order"]),
+            (GameState.red_unit_by_coordinate, state["red_order"]),
+        ):
+            ordered = {coordinate: unit_by_coordinate[coordinate] for coordinate in order}
+            unit_by_coordinate.clear()
+            unit_by_coordinate.update(ordered)
+
+        for unit in units:
+            unit.refresh()
+            unit.view.attach_widgets(unit.model.get_data())
+
+    def _encode(self) -> dict:
+        width = Dimension.HORIZONTAL_FIELD_TILE_COUNT
+        height = Dimension.VERTICAL_TILE_COUNT
+
+        if self._board_revision != GameState.revisions["cost"]:
+            coordinates = [(x, y) for y in range(height) for x in range(width)]
+            index_by_name = {name: i for i, name in enumerate(FIELD_NAMES)}
+
+            costs = array("b", [GameState.cost_by_coordinate[coordinate] for coordinate in coordinates])
+            field_names = bytes(
+                index_by_name.get(GameState.field_name_by_coordinate.get(coordinate), _UNKNOWN_FIELD_NAME)
+                for coordinate in coordinates
+            )
+
+            self._board = (costs.tobytes(), field_names)
+            self._board_revision = GameState.revisions["cost"]
+
+        control = GameState.controls["end_turn"]
+
+        return {
+            "width": width,
+            "height": height,
+            "seed": GameState.seed,
+            "rng": GameState.rng.getstate(),
+            "wave": GameState.wave,
+            "day": GameState.displays["day"].model.day,
+            "coin": GameState.displays["coin"].model.coin,
+            "end_turn": (control.model.day_phase, control.model.first_wave_names, control.model.victorious),
+            "costs": self._board[0],
+            "field_names": self._board[1],
+            "buildings": [
+                (type(building).__name__, building.model.x, building.model.y, building.model.health)
+                for kind in ("critical", "noncritical")
+                for building in GameState.buildings[kind]
+            ],
+            "soldiers": [
+                (
+                    type(soldier).__name__,
+                    soldier.model.x,
+                    soldier.model.y,
+                    soldier.model.color,
+                    *(getattr(soldier.model, field) for field in SOLDIER_FIELDS),
+                )
+                for color in ("blue", "red")
+                for soldier in GameState.soldiers[color]
+            ],
+            "blue_order": list(GameState.blue_unit_by_coordinate),
+            "red_order": list(GameState.red_unit_by_coordinate),
+        }
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+
+    def find_class(self, module: str, name: str) -> None:
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a snapshot.")
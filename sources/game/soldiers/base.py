@@ -2,20 +2,42 @@ import heapq
 import tkinter as tk
 from collections.abc import Callable
 from enum import IntEnum, auto
-from tkinter import ttk
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
-from game.base import GameObject, GameObjectModel, GameObjectView
+from game.animations import animate
+from game.base import GameObject, GameObjectModel, UnitView
+from game.commands import record
 from game.configurations import Color, Dimension
 from game.highlights import AttackRangeHighlight, MovementHighlight
 from game.images import Image
+from game.instrumentation import instrumented
+from game.pathfinding import get_approaching_path, get_movement_tables, get_reachable_coordinates
+from game.spatial import get_diamond_offsets
 from game.states import Environment, GameState
-from game.utilities import get_pixels, msleep
 
 if TYPE_CHECKING:
     from game.buildings.base import Building, BuildingModel
 
 
+class Intent(IntEnum):
+    MOVE_THEN_KILL = auto()
+    MOVE_THEN_HIT = auto()
+    MOVE = auto()
+
+
+class HuntAction(NamedTuple):
+    """
+    A soldier's move along path, then its attack on target dealing damage, which
+    kills target if kill is set. A damage of 0 means target is out of reach.
+    """
+
+    soldier: "Soldier"
+    path: tuple[tuple[int, int]]
+    target: "Soldier | Building"
+    damage: float
+    kill: bool
+
+
 class SoldierModel(GameObjectModel):
 
     attack = 30.0
@@ -40,12 +62,10 @@ class SoldierModel(GameObjectModel):
 
         if self.color == Color.BLUE:
             self._boundaries = (1, Dimension.HORIZONTAL_FIELD_TILE_COUNT - 2, 1, Dimension.VERTICAL_TILE_COUNT - 2)
-            self._friendly_coordinates = GameState.blue_unit_by_coordinate
-            self._hostile_coordinates = GameState.red_unit_by_coordinate
+            self._hostile_color = Color.RED
         else:
             self._boundaries = (0, Dimension.HORIZONTAL_FIELD_TILE_COUNT - 1, 0, Dimension.VERTICAL_TILE_COUNT - 1)
-            self._friendly_coordinates = GameState.red_unit_by_coordinate
-            self._hostile_coordinates = GameState.blue_unit_by_coordinate
+            self._hostile_color = Color.BLUE
 
     # GET
     def get_data(self) -> dict:
@@ -69,131 +89,45 @@ class SoldierModel(GameObjectModel):
         }
         return data
 
-    def get_reachable_coordinates(self) -> set[tuple[int, int]]:
-        x_min, x_max, y_min, y_max = self._boundaries
-
-        # Dijkstra
-        start = (self.x, self.y)
-        frontier = [(0, start)]
-        cost_table = {start: 0}
-        reachables = set()
-
-        while frontier:
-            cost_so_far, current = heapq.heappop(frontier)
-
-            if cost_so_far <= self.mobility and current not in self._friendly_coordinates:
-                reachables.add(current)
-
-            if cost_so_far >= self.mobility:
-                continue
-
-            for dx, dy in {(1, 0), (0, 1), (-1, 0), (0, -1)}:
-                neighbor = x, y = current[0] + dx, current[1] + dy
-
-                if (
-                    x_min <= x <= x_max
-                    and y_min <= y <= y_max
-                    and neighbor not in self._hostile_coordinates
-                ):
-                    step_cost = GameState.cost_by_coordinate[neighbor]
-                    if step_cost == -1:
-                        step_cost = self.mobility
-
-                    new_cost = cost_so_far + step_cost
-
-                    if neighbor not in cost_table or new_cost < cost_table[neighbor]:
-                        heapq.heappush(frontier, (new_cost, neighbor))
-                        cost_table[neighbor] = new_cost
-
-        return reachables
+    def get_reachable_coordinates(self) -> frozenset[tuple[int, int]]:
+        return get_reachable_coordinates((self.x, self.y), self.mobility, self._boundaries, self.color)
 
     def get_attackable_coordinates(self) -> set[tuple[int, int]]:
-        attackables = set()
+        return {(self.x + dx, self.y + dy) for dx, dy in get_diamond_offsets(self.attack_range)}
 
-        for offset in range(self.attack_range + 1):
-            for i in range(-offset, offset + 1):
-                j = offset - abs(i)
-                attackables.add((self.x + i, self.y + j))
-                if j != 0:
-                    attackables.add((self.x + i, self.y - j))
-
-        return attackables
+    def get_attackable_hostile_coordinates(self) -> list[tuple[int, int]]:
+        return GameState.unit_index.get_units_in_range((self.x, self.y), self.attack_range, self._hostile_color)
 
     def get_approaching_path(self, hostile_unit: "SoldierModel | BuildingModel") -> tuple[tuple[int, int]]:
         """
-        Use the A* pathfinding algorithm to compute the cheapest path for self to
-        move toward hostile_unit until hostile_unit is within self's attack range.
-        Trim the path so that it ends at the furthest coordinate self can reach
-        this turn and return it.
+        Compute the cheapest path for self to move toward hostile_unit until
+        hostile_unit is within self's attack range. Return the part of it self can
+        travel this turn.
+        """
+        return get_approaching_path(
+            (self.x, self.y),
+            self.mobility,
+            self.attack_range,
+            self._boundaries,
+            self.color,
+            (hostile_unit.x, hostile_unit.y),
+        )
+
+    def get_path_to(self, coordinate: tuple[int, int]) -> tuple[tuple[int, int]]:
+        """
+        Return the cheapest path for self to move to coordinate, which must be
+        reachable this turn.
         """
-        x_min, x_max, y_min, y_max = self._boundaries
-
-        start = (self.x, self.y)
-        frontier = [(0, start)]
-        cost_table = {start: 0}
-        parent_table = {start: None}
-
-        optimal_path_this_turn = [start]
-        optimal_goal_cost = 65535
-
-        while frontier:
-            _, current = heapq.heappop(frontier)
-
-            if hostile_unit.get_distance_to(current) <= self.attack_range:
-                c = current
-
-                goal_path = []
-                while c:
-                    goal_path.append(c)
-                    c = parent_table[c]
-                goal_path.reverse()
-
-                path_this_turn = [goal_path[0]]
-                cost_this_turn = 0
-                for step in goal_path[1:]:
-                    step_cost = GameState.cost_by_coordinate[step]
-                    if step_cost == -1:
-                        step_cost = self.mobility
-
-                    if cost_this_turn + step_cost > self.mobility:
-                        break
-
-                    path_this_turn.append(step)
-                    cost_this_turn += step_cost
-
-                if (
-                    cost_table[current] < optimal_goal_cost
-                    and path_this_turn[-1] not in self._friendly_coordinates
-                ):
-                    optimal_path_this_turn = path_this_turn
-                    optimal_goal_cost = cost_table[current]
-
-                continue
-
-            for dx, dy in {(1, 0), (0, 1), (-1, 0), (0, -1)}:
-                neighbor = x, y = current[0] + dx, current[1] + dy
-
-                if (
-                    x_min <= x <= x_max
-                    and y_min <= y <= y_max
-                    and neighbor not in self._hostile_coordinates
-                ):
-                    step_cost = GameState.cost_by_coordinate[neighbor]
-                    if step_cost == -1:
-                        step_cost = self.mobility
-
-                    new_cost = cost_table[current] + step_cost
-
-                    if neighbor not in cost_table or new_cost < cost_table[neighbor]:
-                        heapq.heappush(
-                            frontier,
-                            (new_cost + hostile_unit.get_distance_to(neighbor), neighbor),
-                        )
-                        cost_table[neighbor] = new_cost
-                        parent_table[neighbor] = current
-
-        # TODO: When hostile_unit is surrounded by obstacles, self should try to approach it.
-        return tuple(optimal_path_this_turn)
+        _, parent_table = get_movement_tables((self.x, self.y), self.mobility, self._boundaries, self.color)
+
+        path = []
+        c = coordinate
+        while c:
+            path.append(c)
+            c = parent_table[c]
+        path.reverse()
+
+        return tuple(path)
 
     def get_damage_output_against(self, hostile_unit: "SoldierModel | BuildingModel") -> float:
         multiplier = self.attack_multipliers.get(type(hostile_unit).__name__, 1.0)
@@ -235,92 +169,73 @@ class SoldierModel(GameObjectModel):
             self.max_health *= 1.1
 
 
-class SoldierView(GameObjectView):
+class SoldierView(UnitView):
 
-    def _create_widgets(self) -> None:
-        self._widgets["main"] = ttk.Label(self.canvas)
-        self._widgets["level"] = ttk.Label(self.canvas)
-        self._widgets["health_bar"] = ttk.Progressbar(
-            self.canvas,
-            length=Dimension.HEALTH_BAR_LENGTH,
-            mode="determinate",
-            orient=tk.HORIZONTAL,
-            style="Green_Red.Horizontal.TProgressbar",
-        )
+    def _attach_extra_items(self, x: float, y: float, tags: tuple[str, str]) -> None:
+        self._ids["level"] = self.canvas.create_image(x - 15.0, y - 10.0, tags=tags)
 
-    def attach_widgets(self, data: dict) -> None:
-        self._ids["main"] = self.canvas.create_window(
-            *get_pixels(data["x"], data["y"], y_pixel_shift=5.0),
-            window=self._widgets["main"],
-        )
-        self._ids["level"] = self.canvas.create_window(
-            *get_pixels(data["x"], data["y"], x_pixel_shift=-15.0, y_pixel_shift=-10.0),
-            window=self._widgets["level"],
-        )
-        self._ids["health_bar"] = self.canvas.create_window(
-            *get_pixels(data["x"], data["y"], y_pixel_shift=-22.5),
-            window=self._widgets["health_bar"],
-        )
+    def _render(self) -> None:
+        data = self._data
 
-    def refresh(self, data: dict, event_handlers: dict[str, Callable]) -> None:
         if data["color"] == Color.BLUE and data["moved_this_turn"] and data["attacked_this_turn"]:
-            cursor = "arrow"
+            self._cursor = "arrow"
             hex_triplet = Color.GRAY
-            self._widgets["main"].unbind("<ButtonPress-1>")
+            self._bind("<ButtonPress-1>", None)
         else:
-            cursor = "hand2"
+            self._cursor = "hand2"
             hex_triplet = data["color"]
-            self._widgets["main"].bind("<ButtonPress-1>", event_handlers["press"])
+            self._bind("<ButtonPress-1>", self._event_handlers["press"])
 
         color_name = Color.COLOR_NAME_BY_HEX_TRIPLET[hex_triplet]
         soldier_name = type(self).__name__.removesuffix("View").lower()
 
-        self._widgets["main"].configure(
-            cursor=cursor,
+        self._move_items_to(data["x"], data["y"])
+        self._configure_box(hex_triplet)
+        self._configure_item(
+            "main",
             image=getattr(Image, f"{color_name}_{soldier_name}"),
-            style=f"Custom{color_name.capitalize()}.TButton",
+            state=tk.NORMAL,
         )
-        self._widgets["level"].configure(
-            cursor="arrow",
+        self._configure_item(
+            "level",
             image=getattr(Image, f"{color_name}_level_{data["level"]}"),
-            style=f"Flat.Custom{color_name.capitalize()}.TButton",
-        )
-        self._widgets["health_bar"].configure(
-            maximum=round(data["max_health"], 2),
-            value=round(data["health"], 2),
+            state=tk.NORMAL,
         )
+        self._configure_health_bar(data["health"], data["max_health"])
 
-        if self._ids:
-            self.canvas.coords(
-                self._ids["main"],
-                *get_pixels(data["x"], data["y"], y_pixel_shift=5.0),
-            )
-            self.canvas.coords(
-                self._ids["level"],
-                *get_pixels(data["x"], data["y"], x_pixel_shift=-15.0, y_pixel_shift=-10.0),
-            )
-            self.canvas.coords(
-                self._ids["health_bar"],
-                *get_pixels(data["x"], data["y"], y_pixel_shift=-22.5),
-            )
+    def get_main_center(self) -> tuple[float, float]:
+        self.flush_moves()
+        return tuple(self.canvas.coords(self._ids["main"]))
 
     def grab_and_bind(self, handler_by_event: dict[str, Callable]) -> None:
-        self._widgets["main"].grab_set()
+        # While the mouse button is held, the canvas keeps delivering events to the
+        # pressed item, so no grab is needed.
         for event, handler in handler_by_event.items():
-            self._widgets["main"].bind(event, handler)
+            self._bind(event, handler)
 
     def unbind_and_release(self, events: tuple[str]) -> None:
         for event in events:
-            self._widgets["main"].unbind(event)
-        self._widgets["main"].grab_release()
-
-    def move_by(self, dx: int, dy: int) -> None:
-        for widget in self._widgets.values():
-            widget.place(x=widget.winfo_x() + dx, y=widget.winfo_y() + dy)
+            self._bind(event, None)
 
 
 class Soldier(GameObject):
 
+    @classmethod
+    def recruit(cls, x: int, y: int, view_config: dict) -> "Soldier":
+        """
+        Pay for a blue soldier and place it on (x, y). It can act from the next turn.
+        """
+        coin_display = GameState.displays["coin"]
+        coin_display.model.coin -= cls.get_model_class().cost
+        coin_display.refresh()
+
+        soldier = cls.create({"x": x, "y": y, "color": Color.BLUE}, view_config)
+        soldier.model.moved_this_turn = True
+        soldier.model.attacked_this_turn = True
+        soldier.refresh()
+
+        return soldier
+
     def _register(self) -> None:
         if self.model.color == Color.BLUE:
             self._friendly_unit_by_coordinate = GameState.blue_unit_by_coordinate
@@ -332,16 +247,24 @@ class Soldier(GameObject):
             self._friendly_soldiers = GameState.soldiers["red"]
 
         self._friendly_unit_by_coordinate[(self.model.x, self.model.y)] = self
-        self._friendly_soldiers.add(self)
+        GameState.unit_index.add(self.model.color, (self.model.x, self.model.y))
+        self._friendly_soldiers[self] = None
+        GameState.revisions[self.model.color] += 1
+
+        if grid := GameState.grid:
+            grid.occupy(self.model.color, (self.model.x, self.model.y))
 
     def _unregister(self) -> None:
         del self._friendly_unit_by_coordinate[(self.model.x, self.model.y)]
-        self._friendly_soldiers.remove(self)
+        GameState.unit_index.remove(self.model.color, (self.model.x, self.model.y))
+        del self._friendly_soldiers[self]
+        GameState.revisions[self.model.color] += 1
+
+        if grid := GameState.grid:
+            grid.vacate(self.model.color, (self.model.x, self.model.y))
 
     def move_to(self, x: int, y: int) -> None:
-        del self._friendly_unit_by_coordinate[(self.model.x, self.model.y)]
-        self.model.move_to(x, y)
-        self._friendly_unit_by_coordinate[(self.model.x, self.model.y)] = self
+        self._relocate(x, y)
         self.refresh()
 
     def assault(self, hostile_unit: "Soldier | Building") -> None:
@@ -349,13 +272,7 @@ class Soldier(GameObject):
         self.refresh()
 
         if hostile_unit.model.health:
-            # Blink a unit's image when it is being attacked
-            hostile_unit.view._widgets["main"].configure(image=Image.transparent_40x40)
-            if "level" in hostile_unit.view._widgets:
-                hostile_unit.view._widgets["level"].configure(image=Image.transparent_10x10)
-
-            msleep(hostile_unit.view.canvas.master, 100)
-
+            self._blink(hostile_unit)
             hostile_unit.refresh()
             hostile_unit_destroyed = False
         else:
@@ -381,50 +298,143 @@ class Soldier(GameObject):
         """
         Identify the optimal hostile unit then move toward and potentially attack it.
         """
+        action = self.plan_hunt()
+        self.execute(action)
+        self.play(action)
 
-        class Action(IntEnum):
-            MOVE_THEN_KILL = auto()
-            MOVE_THEN_HIT = auto()
-            MOVE = auto()
-
+    @instrumented("hunt")
+    def plan_hunt(self) -> HuntAction:
+        """
+        Identify the optimal hostile unit and decide how to move toward and
+        potentially attack it, without changing anything. Between otherwise equal
+        targets, the one that can be approached on the least dangerous tile is
+        preferred, according to this turn's influence map.
+        """
         priority_queue = []
+        influence_map = GameState.influence_map
+
+        # Only the hostile units within mobility plus attack range can be attacked
+        # this turn, so the others are only weighed when none of those can.
+        nearby_coordinates = set(
+            GameState.unit_index.get_units_in_range(
+                (self.model.x, self.model.y),
+                self.model.mobility + self.model.attack_range,
+                Color.RED if self.model.color == Color.BLUE else Color.BLUE,
+            )
+        )
+        nearby_candidates = []
+        distant_candidates = []
 
         for i, hostile_unit in enumerate(self._hostile_unit_by_coordinate.values()):
-            path = self.model.get_approaching_path(hostile_unit.model)
-            distance = hostile_unit.model.get_distance_to(path[-1])
+            if (hostile_unit.model.x, hostile_unit.model.y) in nearby_coordinates:
+                nearby_candidates.append((i, hostile_unit))
+            else:
+                distant_candidates.append((i, hostile_unit))
+
+        for candidates in (nearby_candidates, distant_candidates):
+            for i, hostile_unit in candidates:
+                path = self.model.get_approaching_path(hostile_unit.model)
+                distance = hostile_unit.model.get_distance_to(path[-1])
+                damage = self.model.get_damage_output_against(hostile_unit.model)
+                danger = influence_map.get_danger(self.model.color, path[-1]) if influence_map else 0.0
+
+                if distance > self.model.attack_range:
+                    intent = Intent.MOVE
+                    order_by = [distance, danger, -damage, hostile_unit.model.health]
+                elif damage < hostile_unit.model.health:
+                    intent = Intent.MOVE_THEN_HIT
+                    order_by = [-damage, danger, hostile_unit.model.health, distance]
+                else:
+                    intent = Intent.MOVE_THEN_KILL
+                    order_by = [-damage, danger, distance]
+
+                heapq.heappush(priority_queue, (intent, *order_by, i, path, hostile_unit))
+
+            if priority_queue and priority_queue[0][0] != Intent.MOVE:
+                break
+
+        intent, *_, path, hostile_unit = heapq.heappop(priority_queue)
+
+        if intent == Intent.MOVE:
+            damage = 0.0
+        else:
             damage = self.model.get_damage_output_against(hostile_unit.model)
 
-            if distance > self.model.attack_range:
-                action = Action.MOVE
-                order_by = [distance, -damage, hostile_unit.model.health]
-            elif damage < hostile_unit.model.health:
-                action = Action.MOVE_THEN_HIT
-                order_by = [-damage, hostile_unit.model.health, distance]
-            else:
-                action = Action.MOVE_THEN_KILL
-                order_by = [-damage, distance]
+        return HuntAction(self, path, hostile_unit, damage, intent == Intent.MOVE_THEN_KILL)
+
+    def execute(self, action: HuntAction) -> None:
+        """
+        Carry out action on the models and the board. The views are left untouched
+        until action is played.
+        """
+        self._relocate(*action.path[-1])
 
-            heapq.heappush(priority_queue, (action, *order_by, i, path, hostile_unit))
+        if action.damage:
+            self.model.assault(action.target.model)
 
-        action, *_, path, hostile_unit = heapq.heappop(priority_queue)
+            if action.kill:
+                action.target.retire()
+                if GameState.selected_unit is action.target:
+                    GameState.selected_unit = None
 
-        self.move_to(*path[-1])
+    def play(self, action: HuntAction, target_data: dict | None = None) -> None:
+        """
+        Show action, once executed, on the views. target_data is the state of the
+        target right after action, and defaults to its current state.
+        """
+        path = action.path
+        target = action.target
 
-        # Display trail
-        highlights = [
-            MovementHighlight.create({"x": x, "y": y}, {"canvas": self.view.canvas})
-            for x, y in path[:-1]
-        ]
+        # Show the move once every tile along the path is clear.
+        animate((self, *path))
+        self.refresh()
 
-        msleep(self.view.canvas.master, 200)
+        if not Environment.headless:
+            # Display trail
+            canvas = self.view.canvas
+            highlights = []
 
-        for highlight in highlights:
-            highlight.destroy()
+            def show_trail() -> None:
+                for x, y in path[:-1]:
+                    highlights.append(MovementHighlight.create({"x": x, "y": y}, {"canvas": canvas}))
+
+            def hide_trail() -> None:
+                for highlight in highlights:
+                    highlight.destroy()
+
+            animate((self, *path), ((0, show_trail), (200, hide_trail)), duration=400)
+
+        if action.kill:
+            target.dispose()
+        elif action.damage:
+            self._blink(target)
+            target.render(target_data or target.model.get_data())
+
+        if action.damage:
+            self._refresh_stat_display()
 
-        msleep(self.view.canvas.master, 200)
+    def _relocate(self, x: int, y: int) -> None:
+        del self._friendly_unit_by_coordinate[(self.model.x, self.model.y)]
+        GameState.unit_index.move(self.model.color, (self.model.x, self.model.y), (x, y))
+        if grid := GameState.grid:
+            grid.vacate(self.model.color, (self.model.x, self.model.y))
 
-        if action in {Action.MOVE_THEN_HIT, Action.MOVE_THEN_KILL}:
-            self.assault(hostile_unit)
+        self.model.move_to(x, y)
+
+        self._friendly_unit_by_coordinate[(self.model.x, self.model.y)] = self
+        if grid := GameState.grid:
+            grid.occupy(self.model.color, (self.model.x, self.model.y))
+
+        GameState.revisions[self.model.color] += 1
+
+    def _blink(self, hostile_unit: "Soldier | Building") -> None:
+        if not Environment.headless:
+            # Blink a unit's image when it is being attacked
+            animate(
+                (self, hostile_unit, (hostile_unit.model.x, hostile_unit.model.y)),
+                ((0, hostile_unit.view.hide_images),),
+                duration=100,
+            )
 
     @property
     def event_handlers(self) -> dict[str, Callable]:
@@ -480,24 +490,26 @@ class Soldier(GameObject):
     def _handle_drag_event(self, event: tk.Event) -> None:
         if self.model.color == Color.BLUE:
             self.view.move_by(event.x - self._pressed_x, event.y - self._pressed_y)
+            self._pressed_x = event.x
+            self._pressed_y = event.y
 
     def _handle_release_event(self, event: tk.Event) -> None:
         self.view.unbind_and_release(("<ButtonRelease-1>", "<Motion>"))
 
         if self.model.color == Color.BLUE:
-            widget = self.view._widgets["main"]
-            x = widget.winfo_x()
-            y = widget.winfo_y()
+            x, y = self.view.get_main_center()
 
-            overlapping_ids = set(self.view.canvas.find_overlapping(x, y, x + 40, y + 40))
+            overlapping_ids = set(self.view.canvas.find_overlapping(x - 20, y - 20, x + 20, y + 20))
 
             if target_ids := overlapping_ids & set(self._movement_target_by_id):
                 if len(target_ids) == 1:
                     highlight = self._movement_target_by_id[target_ids.pop()]
+                    record("move", self.model.x, self.model.y, highlight.model.x, highlight.model.y)
                     self.move_to(highlight.model.x, highlight.model.y)
             elif target_ids := overlapping_ids & set(self._attack_target_by_id):
                 if len(target_ids) == 1:
                     hostile_unit = self._attack_target_by_id[target_ids.pop()]
+                    record("assault", self.model.x, self.model.y, hostile_unit.model.x, hostile_unit.model.y)
                     self.assault(hostile_unit)
 
             self.view.detach_widgets()
@@ -528,10 +540,9 @@ class Soldier(GameObject):
         )
 
         if prepare_drop:
-            coordinates = self.model.get_attackable_coordinates()
-            for unit in self._hostile_unit_by_coordinate.values():
-                if (unit.model.x, unit.model.y) in coordinates:
-                    self._attack_target_by_id[unit.view._ids["main"]] = unit
+            for coordinate in self.model.get_attackable_hostile_coordinates():
+                unit = self._hostile_unit_by_coordinate[coordinate]
+                self._attack_target_by_id[unit.view._ids["main"]] = unit
 
     def _destroy_highlights(self) -> None:
         for highlight in set(GameState.highlights["movement"]):
@@ -0,0 +1,113 @@
+from functools import lru_cache
+
+from game.configurations import Color
+
+# Side of the square blocks of tiles units are bucketed into. Attack ranges are a
+# few tiles, so a range query touches a handful of buckets.
+BUCKET_DIMENSION = 4
+
+
+@lru_cache(maxsize=None)
+def get_diamond_offsets(radius: int) -> tuple[tuple[int, int], ...]:
+    """
+    Return the offsets of every tile within Manhattan distance radius of a tile,
+    row by row.
+    """
+    return tuple(
+        (dx, dy)
+        for dy in range(-radius, radius + 1)
+        for dx in range(abs(dy) - radius, radius - abs(dy) + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_bucket_offsets(radius: int, x_remainder: int, y_remainder: int) -> tuple[tuple[int, int, bool], ...]:
+    """
+    Return the offsets of every bucket overlapping the diamond of radius around a
+    tile at x_remainder, y_remainder within its bucket, and whether the bucket lies
+    entirely within the diamond.
+    """
+    offsets = []
+
+    def get_distance_range(low: int, high: int) -> tuple[int, int]:
+        nearest = 0 if low <= 0 <= high else min(abs(low), abs(high))
+        return nearest, max(abs(low), abs(high))
+
+    for by in range((y_remainder - radius) // BUCKET_DIMENSION, (y_remainder + radius) // BUCKET_DIMENSION + 1):
+        y_nearest, y_farthest = get_distance_range(
+            by * BUCKET_DIMENSION - y_remainder,
+            (by + 1) * BUCKET_DIMENSION - 1 - y_remainder,
+        )
+
+        for bx in range((x_remainder - radius) // BUCKET_DIMENSION, (x_remainder + radius) // BUCKET_DIMENSION + 1):
+            x_nearest, x_farthest = get_distance_range(
+                bx * BUCKET_DIMENSION - x_remainder,
+                (bx + 1) * BUCKET_DIMENSION - 1 - x_remainder,
+            )
+
+            if x_nearest + y_nearest <= radius:
+                offsets.append((bx, by, x_farthest + y_farthest <= radius))
+
+    return tuple(offsets)
+
+
+class SpatialIndex:
+    """
+    The coordinates of each side's units, bucketed into square blocks of tiles, so
+    that finding the units within a distance of a tile only visits the few buckets
+    around it instead of every unit.
+    """
+
+    def __init__(self) -> None:
+        self._buckets = {
+            Color.BLUE: {},
+            Color.RED: {},
+        }
+
+    def clear(self) -> None:
+        for buckets in self._buckets.values():
+            buckets.clear()
+
+    # SET
+    def add(self, color: str, coordinate: tuple[int, int]) -> None:
+        key = (coordinate[0] // BUCKET_DIMENSION, coordinate[1] // BUCKET_DIMENSION)
+        self._buckets[color].setdefault(key, set()).add(coordinate)
+
+    def remove(self, color: str, coordinate: tuple[int, int]) -> None:
+        buckets = self._buckets[color]
+        key = (coordinate[0] // BUCKET_DIMENSION, coordinate[1] // BUCKET_DIMENSION)
+
+        bucket = buckets[key]
+        bucket.remove(coordinate)
+        if not bucket:
+            del buckets[key]
+
+    def move(self, color: str, source: tuple[int, int], destination: tuple[int, int]) -> None:
+        self.remove(color, source)
+        self.add(color, destination)
+
+    # GET
+    def get_units_in_range(self, center: tuple[int, int], radius: int, color: str) -> list[tuple[int, int]]:
+        """
+        Return the coordinates of every unit of color within Manhattan distance radius
+        of center, row by row.
+        """
+        x, y = center
+        bucket_x, x_remainder = divmod(x, BUCKET_DIMENSION)
+        bucket_y, y_remainder = divmod(y, BUCKET_DIMENSION)
+        buckets = self._buckets[color]
+        coordinates = []
+
+        for dx, dy, inside in _get_bucket_offsets(radius, x_remainder, y_remainder):
+            if bucket := buckets.get((bucket_x + dx, bucket_y + dy)):
+                if inside:
+                    coordinates.extend(bucket)
+                else:
+                    coordinates.extend(
+                        coordinate
+                        for coordinate in bucket
+                        if abs(coordinate[0] - x) + abs(coordinate[1] - y) <= radius
+                    )
+
+        coordinates.sort(key=lambda coordinate: (coordinate[1], coordinate[0]))
+        return coordinates
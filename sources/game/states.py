@@ -1,8 +1,13 @@
+import random
 from typing import Optional
 
+from game.configurations import Color
+from game.spatial import SpatialIndex
+
 
 class Environment:
 
+    headless = False
     screen_height: Optional[int] = None
     screen_width: Optional[int] = None
     tcl_tk_version: Optional[str] = None
@@ -11,9 +16,12 @@ class Environment:
 
 class GameState:
 
+    # Units are kept in dicts used as ordered sets, rather than in sets, so they
+    # are iterated in the order they were added whatever their memory addresses,
+    # and a seeded game plays out the same every time.
     buildings = {
-        "critical": set(),
-        "noncritical": set(),
+        "critical": {},
+        "noncritical": {},
     }
     controls = {
         "display_outcome": None,
@@ -22,6 +30,7 @@ class GameState:
     displays = {
         "coin": None,
         "day": None,
+        "performance": None,
         "production": None,
         "stat": None,
     }
@@ -34,8 +43,8 @@ class GameState:
         "barrack": set(),
     }
     soldiers = {
-        "blue": set(),
-        "red": set(),
+        "blue": {},
+        "red": {},
     }
 
     selected_game_objects = []
@@ -43,7 +52,71 @@ class GameState:
 
     blue_unit_by_coordinate = {}
     red_unit_by_coordinate = {}
+    unit_index = SpatialIndex()
     cost_by_coordinate = {}
-    image_id_by_coordinate = {}
+    field_name_by_coordinate = {}
+
+    # Bumped whenever the terrain or a side's unit positions change, so that
+    # searches cached against them are invalidated.
+    revisions = {
+        "cost": 0,
+        Color.BLUE: 0,
+        Color.RED: 0,
+    }
+    grid = None
+    influence_map = None
+    landscape = None
+    timeline = None
+    command_log = None
+    autosave = None
+
+    # The single source of randomness of a game, for the landscape and the waves
+    rng = random.Random()
+    seed: Optional[int] = None
 
     wave = 0
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Empty every container in place, since models keep references to them.
+        """
+        for containers in (cls.buildings, cls.controls, cls.displays, cls.highlights, cls.recruitments, cls.soldiers):
+            for key, value in containers.items():
+                if isinstance(value, (dict, set)):
+                    value.clear()
+                else:
+                    containers[key] = None
+
+        cls.selected_game_objects.clear()
+        cls.selected_unit = None
+
+        cls.blue_unit_by_coordinate.clear()
+        cls.red_unit_by_coordinate.clear()
+        cls.unit_index.clear()
+        cls.cost_by_coordinate.clear()
+        cls.field_name_by_coordinate.clear()
+
+        # Revisions only ever increase, so caches from a previous game never hit.
+        for key in cls.revisions:
+            cls.revisions[key] += 1
+        cls.grid = None
+        cls.influence_map = None
+        cls.landscape = None
+        cls.timeline = None
+        cls.command_log = None
+        cls.autosave = None
+
+        cls.wave = 0
+
+    @classmethod
+    def seed_rng(cls, seed: Optional[int] = None) -> None:
+        """
+        Seed the game's random number generator, with a fresh seed unless one is
+        given, and keep the seed so the game can be reproduced.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+
+        cls.seed = seed
+        cls.rng.seed(seed)
@@ -14,6 +14,7 @@ class Style:
     def initialize(cls) -> None:
         style = ttk.Style()
         style.theme_use("default")
+        cls._dpi = get_dpi(style.master)
 
         style.configure(
             "TButton",
@@ -37,10 +38,6 @@ class Style:
             "CustomGray.TButton",
             background=[(Color.GRAY,)],
         )
-        style.map(
-            "CustomRed.TButton",
-            background=[(Color.RED,)],
-        )
         style.map(
             "Royalblue1.TButton",
             background=[("Royalblue1",)],
@@ -61,64 +58,24 @@ class Style:
             "MiddlePanelBox.Black_CustomWood.TButton",
             image=Image.middle_panel_box,
         )
+        style.configure(
+            "PerformancePanelBox.Black_CustomWood.TButton",
+            compound="center",
+            font=("Courier", cls._normalize_font_size(9), "bold"),
+            image=Image.large_panel_box,
+        )
         style.configure(
             "SmallPanelBox.Black_CustomWood.TButton",
             compound="center",
             font=("Courier", cls._normalize_font_size(18), "bold"),
             image=Image.small_panel_box,
         )
-        style.configure(
-            "Flat.CustomBlue.TButton",
-            borderwidth=0,
-            relief=tk.FLAT,
-        )
-        style.configure(
-            "Flat.CustomGray.TButton",
-            borderwidth=0,
-            relief=tk.FLAT,
-        )
-        style.configure(
-            "Flat.CustomRed.TButton",
-            borderwidth=0,
-            relief=tk.FLAT,
-        )
         style.configure(
             "Flat.Royalblue1.TButton",
             borderwidth=0,
             relief=tk.FLAT,
         )
 
-        style.configure(
-            "Green_Red.Horizontal.TProgressbar",
-            background="Green",
-            bordercolor="Red",
-            borderwidth=0,
-            pbarrelief=tk.FLAT,
-            thickness=5,
-            troughcolor="Red",
-        )
-        style.element_create("Green_Red.Horizontal.Progressbar.trough", "from", "clam")
-        style.layout(
-            "Green_Red.Horizontal.TProgressbar",
-            [
-                (
-                    "Green_Red.Horizontal.Progressbar.trough",
-                    {
-                        "children": [
-                            (
-                                "Green_Red.Horizontal.Progressbar.pbar",
-                                {"side": tk.LEFT, "sticky": tk.NS},
-                            ),
-                        ],
-                        "sticky": tk.NSEW,
-                    },
-                ),
-            ],
-        )
-
     @classmethod
     def _normalize_font_size(cls, font_size: int) -> int:
-        if cls._dpi is None:
-            cls._dpi = get_dpi()
-
         return int(font_size * 96 / cls._dpi)
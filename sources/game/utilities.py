@@ -1,24 +1,23 @@
-import shlex
-import subprocess
 import tkinter as tk
 
 from game.configurations import Dimension
 
 
-def execute(command: str) -> str:
-    options = {"capture_output": True, "check": True, "text": True}
-    return subprocess.run(shlex.split(command), **options).stdout.rstrip()
-
+def get_dpi(widget: tk.Misc) -> float:
+    """
+    Return the resolution Tk scales fonts with on the screen of widget.
+    """
+    return widget.winfo_fpixels("1i")
 
-def get_dpi() -> int:
-    try:
-        dpi = int(execute("xrdb -get Xft.dpi"))
-        if dpi <= 0:
-            raise ValueError
-    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
-        dpi = 96
 
-    return dpi
+def get_shades(hex_triplet: str) -> tuple[str, str]:
+    """
+    Compute the light and dark shades of a color, the way Tk draws 3D borders.
+    """
+    components = [int(hex_triplet[i:i + 2], 16) for i in (1, 3, 5)]
+    light = [max(min(c * 14 // 10, 255), (c + 255) // 2) for c in components]
+    dark = [c * 6 // 10 for c in components]
+    return "#{:02X}{:02X}{:02X}".format(*light), "#{:02X}{:02X}{:02X}".format(*dark)
 
 
 def get_pixels(x: int, y: int, *, x_pixel_shift: float = 0.0, y_pixel_shift: float = 0.0) -> tuple[float, float]:
@@ -30,11 +29,3 @@ def get_pixels(x: int, y: int, *, x_pixel_shift: float = 0.0, y_pixel_shift: flo
         Dimension.TILE_DIMENSION * (y + 0.5) + y_pixel_shift,
     )
 
-
-def msleep(widget: tk.Misc, time: int) -> None:
-    """
-    Sleep for time milliseconds.
-    """
-    flag = tk.BooleanVar()
-    widget.after(time, flag.set, True)
-    widget.wait_variable(flag)
@@ -0,0 +1,76 @@
+import sys
+import threading
+import tkinter as tk
+import traceback
+from time import perf_counter
+
+
+class StallWatchdog:
+    """
+    Detect stalls of the Tk event loop. A heartbeat is scheduled with after every
+    interval seconds, and a heartbeat running more than threshold seconds late
+    means the loop was stalled in between. A monitor thread watches the heartbeat
+    meanwhile, and captures the main thread's Python stack as soon as a stall goes
+    past threshold, so each stall is reported with what was running during it.
+    Stalls are reported to stderr as they end, and the worst ones summarized once
+    stopped.
+    """
+
+    def __init__(self, widget: tk.Misc, threshold: float, interval: float = 0.05, summary_size: int = 5) -> None:
+        self._widget = widget
+        self._threshold = threshold
+        self._interval = interval
+        self._summary_size = summary_size
+        self._main_thread_id = threading.main_thread().ident
+
+        # Shared with the monitor thread
+        self._lock = threading.Lock()
+        self._last_beat = perf_counter()
+        self._stack: list[str] | None = None
+
+        self._stalls: list[tuple[float, list[str]]] = []
+        self._after_id = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._monitor, name="StallWatchdog", daemon=True)
+
+    def start(self) -> None:
+        with self._lock:
+            self._last_beat = perf_counter()
+        self._after_id = self._widget.after(round(self._interval * 1000), self._beat)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._after_id:
+            self._widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def report_summary(self) -> None:
+        print(f"{len(self._stalls)} stall(s) over {self._threshold * 1000:.0f} ms", file=sys.stderr)
+
+        for duration, stack in sorted(self._stalls, key=lambda stall: stall[0], reverse=True)[:self._summary_size]:
+            # The innermost frame is where the loop was stuck.
+            where = stack[-1].strip().splitlines()[0] if stack else "(no Python frame)"
+            print(f"{duration * 1000:10.0f} ms  {where}", file=sys.stderr)
+
+    def _beat(self) -> None:
+        now = perf_counter()
+
+        with self._lock:
+            lag = now - self._last_beat - self._interval
+            stack, self._stack = self._stack, None
+            self._last_beat = now
+
+        if lag >= self._threshold:
+            self._stalls.append((lag, stack or []))
+            print(f"Event loop stalled for {lag * 1000:.0f} ms in:", file=sys.stderr)
+            print("".join(stack or ["  (no Python frame)\n"]), end="", file=sys.stderr)
+
+        self._after_id = self._widget.after(round(self._interval * 1000), self._beat)
+
+    def _monitor(self) -> None:
+        while not self._stopped.wait(self._threshold / 2):
+            with self._lock:
+                if self._stack is None and perf_counter() - self._last_beat - self._interval >= self._threshold:
+                    frame = sys._current_frames().get(self._main_thread_id)
+                    self._stack = traceback.format_stack(frame) if frame else []
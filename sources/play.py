@@ -2,49 +2,98 @@
 © 2022-2025 Wei-Ting Yang. All rights reserved.
 """
 
+import argparse
 import sys
 import tkinter as tk
-from random import choices
 
+from game import instrumentation
+from game.animations import Timeline
 from game.buildings import Barrack
+from game.commands import CommandLog
 from game.configurations import Color, Dimension
 from game.controls import EndTurnControl
-from game.displays import CoinDisplay, DayDisplay, ProductionDisplay, StatDisplay
+from game.displays import CoinDisplay, DayDisplay, PerformanceDisplay, ProductionDisplay, StatDisplay
+from game.grids import Grid
 from game.images import Image
+from game.landscapes import LandscapeImage, generate_field_names, get_field_cost
+from game.profiling import StartupProfile
+from game.snapshots import Snapshot
 from game.soldiers import Hero
 from game.states import Environment, GameState
 from game.style import Style
 from game.utilities import get_pixels
+from game.watchdog import StallWatchdog
 
 
 class Program:
 
     def __init__(self) -> None:
-        self._window = tk.Tk()
-        self._detect_environment()
-        self._check_requirements()
-        self._window.title("TkTactics")
-        self._window.resizable(width=False, height=False)
-
-        self._canvas = tk.Canvas(
-            self._window,
-            width=Dimension.TILE_DIMENSION * Dimension.HORIZONTAL_TILE_COUNT,
-            height=Dimension.TILE_DIMENSION * Dimension.VERTICAL_TILE_COUNT,
-            background="Black",
-            highlightthickness=0,
-        )
-        self._canvas.pack()
-
-        Image.initialize()
-        Style.initialize()
-
-        self._create_side_panel()
-        self._create_landscape()
-        self._create_initial_buildings()
-        self._create_initial_blue_soldiers()
+        profile = StartupProfile()
+        arguments = self._parse_arguments()
+        if arguments.load and arguments.log:
+            sys.exit("A loaded game cannot be logged, since its log would not start from the seed.")
+
+        with profile.phase("window"):
+            self._window = tk.Tk()
+            self._detect_environment()
+            self._check_requirements()
+            self._window.title("TkTactics")
+            self._window.resizable(width=False, height=False)
+
+            self._canvas = tk.Canvas(
+                self._window,
+                width=Dimension.TILE_DIMENSION * Dimension.HORIZONTAL_TILE_COUNT,
+                height=Dimension.TILE_DIMENSION * Dimension.VERTICAL_TILE_COUNT,
+                background="Black",
+                highlightthickness=0,
+            )
+            self._canvas.pack()
+
+        GameState.timeline = Timeline(self._window, speed=arguments.speed)
+        GameState.seed_rng(arguments.seed)
+        if arguments.log:
+            GameState.command_log = CommandLog(arguments.log, GameState.seed)
+
+        with profile.phase("images"):
+            Image.initialize()
+        with profile.phase("style"):
+            Style.initialize()
+        with profile.phase("side panel"):
+            self._create_side_panel()
+
+        if arguments.load:
+            with profile.phase("snapshot"):
+                Snapshot(arguments.load).load({"canvas": self._canvas})
+            with profile.phase("landscape"):
+                GameState.landscape = LandscapeImage(self._canvas)
+                GameState.landscape.draw(GameState.field_name_by_coordinate)
+        else:
+            with profile.phase("landscape"):
+                self._create_landscape()
+            with profile.phase("units"):
+                self._create_initial_buildings()
+                self._create_initial_blue_soldiers()
+
+        with profile.phase("grid"):
+            GameState.grid = Grid.create()
+        if arguments.autosave:
+            GameState.autosave = Snapshot(arguments.autosave)
+        EndTurnControl.computer_turn_budget = arguments.ai_deadline / 1000
+
+        if arguments.profile_startup:
+            # Idle callbacks run in order, so this one runs once the first frame has been drawn.
+            self._window.after_idle(profile.report)
+
+        if arguments.stall_threshold is not None:
+            watchdog = StallWatchdog(self._window, arguments.stall_threshold / 1000)
+            watchdog.start()
 
         self._window.mainloop()
 
+        if arguments.stall_threshold is not None:
+            watchdog.stop()
+            watchdog.report_summary()
+
     def _detect_environment(self) -> None:
         Environment.screen_height = self._window.winfo_screenheight()
         Environment.screen_width = self._window.winfo_screenwidth()
@@ -58,6 +107,34 @@ class Program:
         if Environment.windowing_system == "aqua":
             sys.exit("Aqua windowing system is currently not supported.")
 
+    def _parse_arguments(self) -> argparse.Namespace:
+        parser = argparse.ArgumentParser(description="Play TkTactics.")
+        parser.add_argument(
+            "--speed",
+            default=1.0,
+            type=float,
+            help="animation playback speed (0 skips animations)",
+        )
+        parser.add_argument("--seed", type=int, help="seed of the landscape and the waves")
+        parser.add_argument("--log", metavar="PATH", help="append the game's commands to PATH for replay.py")
+        parser.add_argument("--load", metavar="PATH", help="resume the game saved in the snapshot at PATH")
+        parser.add_argument("--autosave", metavar="PATH", help="save the game to a snapshot at PATH after every turn")
+        parser.add_argument("--profile-startup", action="store_true", help="report the time of each startup phase")
+        parser.add_argument(
+            "--ai-deadline",
+            default=EndTurnControl.computer_turn_budget * 1000,
+            metavar="MS",
+            type=float,
+            help="time the computer may spend searching for its moves each turn (0 plays greedily)",
+        )
+        parser.add_argument(
+            "--stall-threshold",
+            metavar="MS",
+            type=float,
+            help="report every event loop stall longer than MS milliseconds, with its stack",
+        )
+        return parser.parse_args()
+
     def _create_side_panel(self) -> None:
         self._canvas.create_image(
             *get_pixels(Dimension.HORIZONTAL_FIELD_TILE_COUNT + 1, Dimension.VERTICAL_TILE_COUNT // 2),
@@ -73,33 +150,25 @@ class Program:
         StatDisplay.create({"x": x, "y": 4.43}, {"canvas": self._canvas})
         ProductionDisplay.create({"x": x, "y": 9.43}, {"canvas": self._canvas})
 
+        if instrumentation.ENABLED:
+            # Shown over the stat display while toggled on with F3
+            display = PerformanceDisplay.create({"x": x, "y": 4.43}, {"canvas": self._canvas, "attach": False})
+            self._window.bind("<F3>", lambda event: display.toggle())
+
     def _create_controls(self) -> None:
         x = Dimension.HORIZONTAL_FIELD_TILE_COUNT + 1
         y = Dimension.VERTICAL_TILE_COUNT - 1
         EndTurnControl.create({"x": x, "y": y}, {"canvas": self._canvas})
 
     def _create_landscape(self) -> None:
-        FIELDS = tuple(
-            [
-                *(getattr(Image, f"grass_{i}") for i in range(1, 16)),
-                Image.rock,
-                Image.tree,
-            ]
-        )
-        WEIGHTS = (56, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 15, 15)
+        for coordinate, name in generate_field_names(GameState.rng).items():
+            GameState.field_name_by_coordinate[coordinate] = name
+            GameState.cost_by_coordinate[coordinate] = get_field_cost(name)
 
-        for y in range(Dimension.VERTICAL_TILE_COUNT):
-            for x in range(Dimension.HORIZONTAL_FIELD_TILE_COUNT):
-                [image] = choices(FIELDS, weights=WEIGHTS)
-                GameState.image_id_by_coordinate[(x, y)] = self._canvas.create_image(
-                    *get_pixels(x, y),
-                    image=image,
-                )
+        GameState.revisions["cost"] += 1
 
-                if image in {Image.rock, Image.tree}:
-                    GameState.cost_by_coordinate[(x, y)] = -1
-                else:
-                    GameState.cost_by_coordinate[(x, y)] = 1
+        GameState.landscape = LandscapeImage(self._canvas)
+        GameState.landscape.draw(GameState.field_name_by_coordinate)
 
     def _create_initial_buildings(self) -> None:
         x = Dimension.HORIZONTAL_FIELD_TILE_COUNT // 2
@@ -107,13 +176,12 @@ class Program:
 
         for dx, dy in {(0, 0), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)}:
             coordinate = (x + dx, y + dy)
-            self._canvas.delete(GameState.image_id_by_coordinate[coordinate])
-            GameState.image_id_by_coordinate[coordinate] = self._canvas.create_image(
-                *get_pixels(*coordinate),
-                image=Image.grass_1,
-            )
+            GameState.landscape.patch(coordinate, "grass_1")
+            GameState.field_name_by_coordinate[coordinate] = "grass_1"
             GameState.cost_by_coordinate[coordinate] = 1
 
+        GameState.revisions["cost"] += 1
+
         Barrack.create({"x": x, "y": y}, {"canvas": self._canvas})
 
     def _create_initial_blue_soldiers(self) -> None:
@@ -0,0 +1,47 @@
+"""
+© 2022-2025 Wei-Ting Yang. All rights reserved.
+"""
+
+import argparse
+import sys
+from time import perf_counter
+
+from game.commands import CommandLog
+from game.replays import Replay
+
+
+class Program:
+
+    def __init__(self) -> None:
+        self._check_requirements()
+        arguments = self._parse_arguments()
+
+        for i, (seed, commands) in enumerate(CommandLog.read(arguments.path), start=1):
+            start = perf_counter()
+            replay = Replay(seed, commands, use_numpy=not arguments.no_numpy)
+            outcome = replay.run()
+            elapsed = perf_counter() - start
+
+            print(
+                f"Game {i} (seed {seed}): {outcome or "Undecided."} "
+                f"({len(commands)} commands, {replay.turn_count} turns in {elapsed:.3f}s)"
+            )
+
+            slowest_turns = sorted(enumerate(replay.turn_durations, start=1), key=lambda turn: -turn[1])
+            for turn, duration in slowest_turns[:arguments.slowest]:
+                print(f"  Turn {turn}: {duration * 1000:.1f} ms")
+
+    def _check_requirements(self) -> None:
+        if sys.version_info < (3, 12):
+            sys.exit("Python version >= 3.12 is required.")
+
+    def _parse_arguments(self) -> argparse.Namespace:
+        parser = argparse.ArgumentParser(description="Replay logged TkTactics games without a display.")
+        parser.add_argument("path", help="command log written by play.py --log")
+        parser.add_argument("--slowest", default=5, type=int, help="number of slowest turns to report")
+        parser.add_argument("--no-numpy", action="store_true", help="keep the board in dicts even if NumPy is installed")
+        return parser.parse_args()
+
+
+if __name__ == "__main__":
+    program = Program()
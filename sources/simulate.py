@@ -0,0 +1,57 @@
+"""
+© 2022-2025 Wei-Ting Yang. All rights reserved.
+"""
+
+import argparse
+import sys
+from time import perf_counter
+
+from game.controls import EndTurnControl
+from game.simulation import Simulation
+from game.states import GameState
+
+
+class Program:
+
+    def __init__(self) -> None:
+        self._check_requirements()
+        arguments = self._parse_arguments()
+
+        EndTurnControl.computer_turn_budget = arguments.ai_deadline / 1000
+
+        for i in range(1, arguments.games + 1):
+            start = perf_counter()
+            seed = None if arguments.seed is None else arguments.seed + i - 1
+            simulation = Simulation(use_numpy=not arguments.no_numpy, seed=seed, snapshot=arguments.load)
+            outcome = simulation.run(arguments.turns)
+            elapsed = perf_counter() - start
+
+            print(
+                f"Game {i} (seed {GameState.seed}): {outcome or "Undecided."} "
+                f"({simulation.turn_count} turns in {elapsed:.3f}s, "
+                f"{simulation.turn_count / elapsed:.0f} turns/s)"
+            )
+
+    def _check_requirements(self) -> None:
+        if sys.version_info < (3, 12):
+            sys.exit("Python version >= 3.12 is required.")
+
+    def _parse_arguments(self) -> argparse.Namespace:
+        parser = argparse.ArgumentParser(description="Play TkTactics games without a display.")
+        parser.add_argument("--games", default=1, type=int, help="number of games to play")
+        parser.add_argument("--turns", default=1000, type=int, help="maximum number of turns per game")
+        parser.add_argument("--seed", type=int, help="seed of the first game, incremented for each next one")
+        parser.add_argument("--load", metavar="PATH", help="start every game from the snapshot at PATH")
+        parser.add_argument(
+            "--ai-deadline",
+            default=EndTurnControl.computer_turn_budget * 1000,
+            metavar="MS",
+            type=float,
+            help="time the red army may spend searching for its moves each turn (0 plays greedily)",
+        )
+        parser.add_argument("--no-numpy", action="store_true", help="keep the board in dicts even if NumPy is installed")
+        return parser.parse_args()
+
+
+if __name__ == "__main__":
+    program = Program()